@@ -1,39 +1,183 @@
 from utils.playback import play_audio
 import sounddevice as sd
-import soundfile as sf
 import numpy as np
-import os
-from datetime import datetime
+import threading
+from utils.audio_spool import get_spool
 
-def record_audio(folder=None):
-    """Record audio until ENTER is pressed and save it as a WAV file."""
-    
-    if folder is None:
-        folder = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data", "audio_samples"))
-    os.makedirs(folder, exist_ok=True)
 
-    filename = datetime.now().strftime("sample_%Y%m%d_%H%M%S.wav")
-    filepath = os.path.join(folder, filename)
+class StreamingEmotionMonitor:
+    """Runs the emotion model on a sliding window while recording is still going.
 
-    sample_rate = 16000
-    print("\n🎙 Recording... Press ENTER to stop.\n")
+    The recorder callback only appends raw chunks (cheap); every hop_ms a
+    background thread keeps the most recent window_frames worth of raw audio
+    and, if new audio arrived, re-computes that window's MFCCs with mfcc()
+    (centered frames, top_db floor over the whole window, exactly as in
+    training) and re-classifies it. latest() returns the current
+    (emotion, probs), so a result is ready as soon as recording stops.
+    """
 
-    recorded_chunks = []
+    def __init__(self, model_path="models/emotion_model.h5", sample_rate=22050, hop_ms=500,
+                 n_mfcc=40, window_frames=200, n_fft=2048, hop_length=512, on_update=None):
+        self.model_path = model_path
+        self.sample_rate = sample_rate
+        self.hop_ms = hop_ms
+        self.n_mfcc = n_mfcc
+        self.window_frames = window_frames
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.on_update = on_update
 
-    def callback(indata, frames, time, status):
-        recorded_chunks.append(indata.copy())
+        self._chunks = []
+        self._chunks_lock = threading.Lock()
+        # Raw samples behind the last window_frames (centered) frames
+        self._audio = np.zeros(0, dtype=np.float32)
+        self._result = (None, None)
+        self._result_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
 
-    # Start stream
-    stream = sd.InputStream(samplerate=sample_rate, channels=1, callback=callback)
-    with stream:
-        input()  # wait for ENTER press
+    def feed(self, indata):
+        """Called from the audio callback with a (frames, channels) block."""
+        with self._chunks_lock:
+            self._chunks.append(indata[:, 0].copy())
+
+    def start(self):
+        # Import and load the model up front so the first window isn't slow.
+        from inference_client import get_predictor
+        self._classifier = get_predictor(self.model_path)
+        try:
+            # Usually already loaded (shared per model path), so this is instant
+            self._classifier.load()
+        except Exception as e:
+            # predict() falls back to random output
+            print("⚠️ Could not load model:", e)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the worker, classify whatever audio is left and return the final result."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        try:
+            self._update()
+        except Exception as e:
+            # Keep the last good result; the caller still has to save the recording
+            print("⚠️ Final emotion update failed:", e)
+        return self.latest()
+
+    def latest(self):
+        with self._result_lock:
+            return self._result
+
+    def _run(self):
+        while not self._stop.wait(self.hop_ms / 1000.0):
+            try:
+                self._update()
+            except Exception as e:
+                print("⚠️ Live emotion update failed:", e)
+
+    def _new_audio(self):
+        """Move fed chunks into the rolling buffer; False if nothing new arrived."""
+        with self._chunks_lock:
+            chunks, self._chunks = self._chunks, []
+        if not chunks:
+            return False
+        keep = (self.window_frames - 1) * self.hop_length
+        self._audio = np.concatenate([self._audio] + chunks)[-keep:]
+        return True
+
+    def window_features(self):
+        """MFCCs (n_mfcc, frames) of the buffered window, same as mfcc() on those samples."""
+        from features.mfcc_engine import mfcc
+
+        return mfcc(self._audio, sr=self.sample_rate, n_mfcc=self.n_mfcc,
+                    n_fft=self.n_fft, hop_length=self.hop_length)
+
+    def _update(self):
+        # Same window as last time: the prediction can't change
+        if not self._new_audio() or len(self._audio) < self.hop_length:
+            return
+
+        emotion, probs = self._classifier.predict(self.window_features())
+        with self._result_lock:
+            self._result = (emotion, probs)
+        if self.on_update:
+            self.on_update(emotion, probs)
+
+
+class Recorder:
+    """Microphone recording controlled by start()/stop() instead of the keyboard.
+
+    If a StreamingEmotionMonitor is given, audio is recorded at its sample
+    rate and fed to it live; its result is final once stop() returns.
+    Recordings are kept in the audio spool for folder (default
+    data/audio_samples), see utils/audio_spool.py.
+    """
 
-    # Save audio
-    audio = np.concatenate(recorded_chunks, axis=0)
-    sf.write(filepath, audio, sample_rate)
-    
-    print(f"✔ Saved audio at: {filepath}\n")
-    return filepath
+    def __init__(self, folder=None, monitor=None):
+        self.spool = get_spool(folder)
+        self.monitor = monitor
+        self.sample_rate = monitor.sample_rate if monitor else 16000
+        self._chunks = []
+        self._stream = None
+
+    def _callback(self, indata, frames, time, status):
+        self._chunks.append(indata.copy())
+        if self.monitor:
+            self.monitor.feed(indata)
+
+    def start(self):
+        if self.monitor:
+            self.monitor.start()
+        self._stream = sd.InputStream(samplerate=self.sample_rate, channels=1, callback=self._callback)
+        self._stream.start()
+        return self
+
+    def _close(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+        if self.monitor:
+            self.monitor.stop()
+
+    def stop(self):
+        """Stop recording, save it to the spool and return its path (None if nothing was recorded)."""
+        self._close()
+        if not self._chunks:
+            return None
+
+        # Save audio (FLAC by default, under a unique sharded name)
+        audio = np.concatenate(self._chunks, axis=0)
+        filepath = self.spool.write(audio, self.sample_rate)
+
+        print(f"✔ Saved audio at: {filepath}\n")
+        return filepath
+
+    def cancel(self):
+        """Stop recording and throw the audio away."""
+        self._close()
+        self._chunks = []
+
+
+def record_audio(folder=None, monitor=None):
+    """Record audio until ENTER is pressed and save it to the audio spool.
+
+    If a StreamingEmotionMonitor is given, audio is recorded at its sample
+    rate and fed to it live; its result is final when this returns.
+    """
+    recorder = Recorder(folder, monitor)
+    print("\n🎙 Recording... Press ENTER to stop.\n")
+
+    recorder.start()
+    try:
+        input()  # wait for ENTER press
+    except BaseException:
+        recorder.cancel()
+        raise
+    return recorder.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,122 @@
+"""
+Augmentation benchmark: can the on-the-fly augmentation keep up with model.fit?
+
+Times each transform of models.augment on a batch of synthetic 4.6 s clips,
+then the full stream (read + augment + MFCC) with 1..N worker threads, and
+compares the streamed batch rate with one training step of a model variant
+(--variant, needs TensorFlow) or a given --step-ms.
+
+Run from src/:  python -m benchmarks.augment_bench [--batch-size 32] [--workers 1 2 4] [--variant lstm]
+"""
+
+import os
+import time
+import argparse
+import numpy as np
+
+from features import mfcc_engine
+from models import augment
+
+MAX_PAD_LEN = 200
+# Same as train_model.WAVE_SAMPLES (not imported: train_model needs TensorFlow)
+WAVE_SAMPLES = (MAX_PAD_LEN - 1) * mfcc_engine.HOP_LENGTH + mfcc_engine.N_FFT // 2
+
+
+def _best_of(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def synthetic_waves(clips, seed=0):
+    """int16 (clips, WAVE_SAMPLES) voiced-ish noise with random lengths, like the waveform pack."""
+    rng = np.random.default_rng(seed)
+    sr = mfcc_engine.SAMPLE_RATE
+    lengths = rng.integers(WAVE_SAMPLES // 2, WAVE_SAMPLES + 1, clips)
+    t = np.arange(WAVE_SAMPLES) / sr
+    pitch = rng.uniform(100, 250, clips)[:, None]
+    waves = 0.3 * np.sin(2 * np.pi * pitch * t) + 0.05 * rng.standard_normal((clips, WAVE_SAMPLES))
+    waves[np.arange(WAVE_SAMPLES)[None, :] >= lengths[:, None]] = 0.0
+    return (waves * 32767).astype(np.int16), lengths
+
+
+def time_transforms(batch_size, repeats):
+    waves, lengths = synthetic_waves(batch_size)
+    x = waves.astype(np.float32) / 32767.0
+    rng = np.random.default_rng(0)
+    rows = len(x)
+
+    results = {
+        "speed": lambda: augment.change_speed(x, lengths, rng.uniform(0.9, 1.1, rows)),
+        "pitch": lambda: augment.shift_pitch(x, lengths, rng.uniform(-2, 2, rows)),
+        "shift": lambda: augment.shift_time(x, lengths, rng.integers(-5000, 5000, rows)),
+        "noise": lambda: augment.add_noise(x, lengths, rng.uniform(10, 40, rows), rng),
+        "all (p=0.5)": lambda: augment.Augmenter()(x, lengths, rng),
+        "mfcc_batch": lambda: augment.waveform_features(x, lengths, MAX_PAD_LEN),
+    }
+    mfcc_engine.mfcc_batch(x[:1])   # warm the filterbank/DCT caches
+    return {name: _best_of(fn, repeats) for name, fn in results.items()}
+
+
+def time_stream(workers, batch_size, batches):
+    waves, lengths = synthetic_waves(batch_size * batches)
+    labels = np.zeros(len(waves), dtype=np.int64)
+    stream = augment.AugmentedBatches(waves, lengths, labels, np.arange(len(waves)),
+                                      batch_size=batch_size, workers=workers)
+    start = time.perf_counter()
+    for _ in stream:
+        pass
+    elapsed = time.perf_counter() - start
+    stream.close()
+    return elapsed / batches
+
+
+def time_train_step(variant, batch_size, repeats):
+    from models.build_model import build_emotion_model
+
+    model = build_emotion_model(input_shape=(None, mfcc_engine.N_MFCC), variant=variant)
+    x = np.random.default_rng(0).standard_normal(
+        (batch_size, MAX_PAD_LEN, mfcc_engine.N_MFCC)).astype(np.float32)
+    y = np.zeros(batch_size, dtype=np.int64)
+    model.train_on_batch(x, y)   # build/trace
+    return _best_of(lambda: model.train_on_batch(x, y), repeats)
+
+
+def run(batch_size=32, workers=None, batches=16, variant=None, step_ms=None, repeats=3):
+    workers = workers or sorted({1, os.cpu_count() or 1})
+    audio_seconds = batch_size * WAVE_SAMPLES / mfcc_engine.SAMPLE_RATE
+
+    print(f"⏱ One batch = {batch_size} clips x {WAVE_SAMPLES / mfcc_engine.SAMPLE_RATE:.1f}s, "
+          f"best of {repeats}\n")
+    for name, elapsed in time_transforms(batch_size, repeats).items():
+        print(f"{name:20s} {elapsed * 1000:8.1f} ms/batch   {audio_seconds / elapsed:8.0f}x realtime")
+
+    if variant:
+        step_ms = time_train_step(variant, batch_size, repeats) * 1000
+        print(f"\n🧠 {variant} train step: {step_ms:.1f} ms/batch")
+
+    print()
+    for n in workers:
+        per_batch = time_stream(n, batch_size, batches)
+        line = f"stream, {n:2d} workers  {per_batch * 1000:8.1f} ms/batch   {1 / per_batch:6.1f} batches/s"
+        if step_ms:
+            line += "   ✔ keeps up" if per_batch * 1000 <= step_ms else "   ❌ fit would wait"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="worker counts to try (default: 1 and all cores)")
+    parser.add_argument("--batches", type=int, default=16)
+    parser.add_argument("--variant", default=None,
+                        help="time a training step of this model variant (needs TensorFlow)")
+    parser.add_argument("--step-ms", type=float, default=None,
+                        help="training step time to compare with, instead of --variant")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run(args.batch_size, args.workers, args.batches, args.variant, args.step_ms, args.repeats)
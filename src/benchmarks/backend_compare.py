@@ -0,0 +1,150 @@
+"""
+Keras vs TFLite backend report: accuracy parity, latency and memory.
+
+Each backend is measured in its own interpreter so peak RSS is comparable.
+The evaluation set is the held-out 20% of the packed dataset (same split as
+train_model.train). Run from src/ after models.export_tflite:
+
+    python -m benchmarks.backend_compare [--model models/emotion_model.h5] [--samples 300]
+
+Writes <out>.md and <out>.json (default data/reports/backend_report).
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import numpy as np
+
+from models.predict import tflite_path
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODEL = os.path.join(SRC_DIR, "models", "emotion_model.h5")
+DEFAULT_OUT = os.path.join(os.path.dirname(SRC_DIR), "data", "reports", "backend_report")
+QUANTS = ["float32", "float16", "dynamic", "int8"]
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def eval_set(samples, seed=42):
+    from sklearn.model_selection import train_test_split
+    from models import train_model
+
+    X, y = train_model.open_packed()
+    _, test_idx = train_test_split(np.arange(len(y)), test_size=0.2, random_state=seed)
+    test_idx = np.sort(test_idx[:samples])
+    return np.asarray(X[test_idx], dtype=np.float32), y[test_idx]
+
+
+def measure(model_path, samples):
+    """Runs inside the child process: load one backend and score the eval set."""
+    from models.predict import get_classifier
+
+    X, y = eval_set(samples)
+    rss_before = _peak_rss_mb()
+
+    t = time.perf_counter()
+    clf = get_classifier(model_path).load()
+    load_s = time.perf_counter() - t
+    rss_loaded = _peak_rss_mb()
+
+    probs, latencies = [], []
+    for features in X:
+        t = time.perf_counter()
+        _, p = clf.predict(features.T)   # predict() takes (40, 200)
+        latencies.append(time.perf_counter() - t)
+        probs.append(np.asarray(p, dtype=float).tolist())
+
+    return {
+        "model_path": model_path,
+        "file_kb": os.path.getsize(model_path) / 1024,
+        "load_ms": load_s * 1000,
+        "latency_ms_p50": float(np.percentile(latencies, 50) * 1000),
+        "latency_ms_p95": float(np.percentile(latencies, 95) * 1000),
+        "rss_model_mb": None if rss_before is None else rss_loaded - rss_before,
+        "rss_peak_mb": _peak_rss_mb(),
+        "labels": y.tolist(),
+        "probs": probs,
+    }
+
+
+def run(model_path=DEFAULT_MODEL, samples=300, out=DEFAULT_OUT):
+    backends = [("keras", model_path)] + [
+        (f"tflite-{q}", tflite_path(model_path, q)) for q in QUANTS
+        if os.path.exists(tflite_path(model_path, q))
+    ]
+
+    results = {}
+    for name, path in backends:
+        print(f"⏱ measuring {name} ...")
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.backend_compare", "--measure", path,
+             "--samples", str(samples)],
+            cwd=SRC_DIR, capture_output=True, text=True,
+            env={**os.environ, "TF_CPP_MIN_LOG_LEVEL": "3"},
+        )
+        if proc.returncode != 0:
+            print(f"   failed: {proc.stderr.strip().splitlines()[-1:]}")
+            continue
+        results[name] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    if "keras" not in results:
+        print("❌ Keras baseline failed; nothing to compare against.")
+        return None
+
+    labels = np.array(results["keras"]["labels"])
+    ref = np.array(results["keras"]["probs"])
+    rows = []
+    for name, r in results.items():
+        probs = np.array(r.pop("probs"))
+        r.pop("labels")
+        r["accuracy"] = float(np.mean(probs.argmax(1) == labels))
+        r["agreement_with_keras"] = float(np.mean(probs.argmax(1) == ref.argmax(1)))
+        r["max_abs_prob_diff"] = float(np.max(np.abs(probs - ref)))
+        rows.append((name, r))
+
+    lines = [
+        f"# Backend comparison ({len(labels)} held-out samples)",
+        "",
+        "| backend | accuracy | agrees w/ keras | max Δp | p50 ms | p95 ms | load ms | file KB | model RSS MB |",
+        "|---|---|---|---|---|---|---|---|---|",
+    ]
+    for name, r in rows:
+        rss = "n/a" if r["rss_model_mb"] is None else f"{r['rss_model_mb']:.0f}"
+        lines.append(
+            f"| {name} | {r['accuracy']:.3f} | {r['agreement_with_keras']:.3f} | "
+            f"{r['max_abs_prob_diff']:.3f} | {r['latency_ms_p50']:.2f} | {r['latency_ms_p95']:.2f} | "
+            f"{r['load_ms']:.0f} | {r['file_kb']:.0f} | {rss} |"
+        )
+    report = "\n".join(lines) + "\n"
+    print("\n" + report)
+
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out + ".md", "w", encoding="utf-8") as f:
+        f.write(report)
+    with open(out + ".json", "w", encoding="utf-8") as f:
+        json.dump(dict(rows), f, indent=2)
+    print(f"✔ Report written to {out}.md / .json")
+    return dict(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--samples", type=int, default=300)
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    parser.add_argument("--measure", help=argparse.SUPPRESS)  # internal: child process mode
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.samples)))
+    else:
+        run(args.model, args.samples, args.out)
@@ -0,0 +1,81 @@
+"""
+MFCC benchmark: librosa vs the shared engine (per clip and batched).
+
+Run from src/:  python -m benchmarks.mfcc_bench [--clips 64] [--seconds 4]
+"""
+
+import argparse
+import time
+import numpy as np
+
+from features import mfcc_engine
+from features.audio_io import resample
+from features.mfcc_extractor import trim_silence
+
+
+def _best_of(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(clips=64, seconds=4.0, repeats=3):
+    sr = mfcc_engine.SAMPLE_RATE
+    rng = np.random.default_rng(0)
+    batch = (rng.standard_normal((clips, int(sr * seconds))) * 0.1).astype(np.float32)
+    audio_seconds = clips * seconds
+
+    results = {}
+
+    # Warm the cached filterbank/DCT so we time steady state
+    mfcc_engine.mfcc_batch(batch[:1])
+
+    results["engine (per clip)"] = _best_of(
+        lambda: [mfcc_engine.mfcc(x) for x in batch], repeats)
+    results["engine (batched)"] = _best_of(
+        lambda: mfcc_engine.mfcc_batch(batch), repeats)
+
+    try:
+        import librosa
+        results["librosa (per clip)"] = _best_of(
+            lambda: [librosa.feature.mfcc(y=x, sr=sr, n_mfcc=40) for x in batch], repeats)
+    except ImportError:
+        print("librosa not installed, skipping reference timing")
+
+    # Resampling 16 kHz mic audio up to the model rate
+    mic = (rng.standard_normal(int(16000 * seconds)) * 0.1).astype(np.float32)
+    results["resample 16k->22.05k (polyphase, 1 clip)"] = _best_of(
+        lambda: resample(mic, 16000, sr), repeats) * clips
+    try:
+        import librosa
+        results["resample 16k->22.05k (kaiser_fast, 1 clip)"] = _best_of(
+            lambda: librosa.resample(mic, orig_sr=16000, target_sr=sr, res_type="kaiser_fast"),
+            repeats) * clips
+    except ImportError:
+        pass
+
+    # VAD trimming ahead of MFCC: speech bursts separated by near-silence
+    t = np.arange(int(sr * seconds)) / sr
+    gated = (batch[0] * (np.sin(2 * np.pi * 0.5 * t) > 0.3)).astype(np.float32)
+    results["vad trim_silence (energy+zcr, 1 clip)"] = _best_of(
+        lambda: trim_silence(gated, sr), repeats) * clips
+    _, stats = trim_silence(gated, sr)
+    print(f"VAD skipped {stats.skipped_samples}/{stats.total_samples} samples "
+          f"({stats.skipped_samples / stats.total_samples:.0%}) of the gated test clip")
+
+    print(f"\n⏱ {clips} clips x {seconds:.1f}s ({audio_seconds:.0f}s of audio), best of {repeats}\n")
+    for name, elapsed in results.items():
+        print(f"{name:45s} {elapsed * 1000 / clips:8.2f} ms/clip   {audio_seconds / elapsed:8.0f}x realtime")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clips", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=4.0)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run(args.clips, args.seconds, args.repeats)
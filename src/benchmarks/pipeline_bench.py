@@ -0,0 +1,237 @@
+"""
+End-to-end pipeline benchmark, stage by stage.
+
+Generates synthetic speech-like WAVs (several lengths x sample rates) and
+times every stage of a turn separately:
+
+  decode, resample, mfcc, model_load, inference, response, tts
+
+inference is EmotionClassifier.predict on the unpadded MFCCs (windowing
+included), the same call the apps make.
+
+TTS uses the local tone synthesizer (same as MOOD_TTS_STUB=1) in a
+throwaway cache, so no network is needed. Each stage reports p50/p95/p99
+latency and its tracemalloc peak (Python + NumPy allocations; TensorFlow
+allocates outside it, see peak RSS).
+
+Run from src/:
+    python -m benchmarks.pipeline_bench                     # print the report
+    python -m benchmarks.pipeline_bench --save-baseline     # record this machine's baseline
+    python -m benchmarks.pipeline_bench --compare           # exit 1 if a stage regressed
+
+A stage regresses when its p50 exceeds the baseline p50 by more than
+--threshold (default 25%).
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import uuid
+import asyncio
+import argparse
+import tempfile
+import tracemalloc
+import numpy as np
+import soundfile as sf
+
+from features import mfcc_engine
+from features.audio_io import resample, _to_mono
+from models.predict import EmotionClassifier, EMOTIONS
+from utils.emotion_responder import get_response, personalize_reply
+from utils.tts_cache import TTSCache, tone_synthesize
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODEL = os.path.join(SRC_DIR, "models", "emotion_model.h5")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(SRC_DIR), "data", "benchmarks",
+                                "pipeline_baseline.json")
+
+SECONDS = (1.0, 3.0, 6.0, 10.0)
+SAMPLE_RATES = (16000, 22050, 44100)
+STAGES = ["decode", "resample", "mfcc", "model_load", "inference", "response", "tts"]
+
+
+def synthetic_wav(seconds, sr, seed=0):
+    """WAV bytes of a voiced-sounding signal: a wobbling harmonic tone with syllable-like bursts."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sr)) / sr
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = np.clip(np.sin(2 * np.pi * 3.0 * t), 0, None)
+    audio = 0.2 * voice * envelope + 0.01 * rng.standard_normal(len(t))
+
+    buf = io.BytesIO()
+    sf.write(buf, audio.astype(np.float32), sr, format="WAV", subtype="PCM_16")
+    return buf.getvalue()
+
+
+def make_clips(folder, seconds=SECONDS, sample_rates=SAMPLE_RATES):
+    clips = []
+    for i, (secs, sr) in enumerate((s, r) for s in seconds for r in sample_rates):
+        path = os.path.join(folder, f"synthetic_{secs:g}s_{sr}.wav")
+        with open(path, "wb") as f:
+            f.write(synthetic_wav(secs, sr, seed=i))
+        clips.append(path)
+    return clips
+
+
+class StageTimer:
+    """Collects per-stage durations (and, with track_memory, tracemalloc peaks)."""
+
+    def __init__(self, track_memory=False):
+        self.track_memory = track_memory
+        self.times = {}
+        self.peaks = {}
+
+    def run(self, stage, fn, *args, **kwargs):
+        if self.track_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.times.setdefault(stage, []).append(time.perf_counter() - start)
+
+        if self.track_memory:
+            peak = tracemalloc.get_traced_memory()[1] - base
+            self.peaks[stage] = max(self.peaks.get(stage, 0), peak)
+        return result
+
+
+def _load_classifier(model_path):
+    clf = EmotionClassifier(model_path, hot_reload=False)
+    return clf.load()
+
+
+def run_pass(clips, model_path, timer, tts_cache, model_loads=3):
+    sr = mfcc_engine.SAMPLE_RATE
+
+    clf = None
+    for _ in range(model_loads):
+        try:
+            clf = timer.run("model_load", _load_classifier, model_path)
+        except Exception as e:
+            print(f"⚠️ Model unavailable, skipping model_load/inference: {e}")
+            break
+
+    for i, path in enumerate(clips):
+        audio, file_sr = timer.run("decode", sf.read, path, dtype="float32")
+        audio = _to_mono(audio)
+        audio = timer.run("resample", resample, audio, file_sr, sr)
+        features = timer.run("mfcc", mfcc_engine.mfcc, audio, sr)
+
+        if clf is not None:
+            emotion, _ = timer.run("inference", clf.predict, features)
+        else:
+            emotion = EMOTIONS[i % len(EMOTIONS)]
+
+        reply = timer.run("response", lambda: personalize_reply(get_response(emotion), "Asha"))
+        # Unique text per call (across passes too) so every call is a cache
+        # miss, i.e. a real synthesis
+        text = f"{reply} ({uuid.uuid4().hex[:8]})"
+        timer.run("tts", lambda: asyncio.run(tts_cache.get(text)))
+
+
+def summarize(timer):
+    report = {}
+    for stage in STAGES:
+        times = timer.times.get(stage)
+        if not times:
+            continue
+        ms = np.array(times) * 1000
+        report[stage] = {
+            "n": len(ms),
+            "p50_ms": float(np.percentile(ms, 50)),
+            "p95_ms": float(np.percentile(ms, 95)),
+            "p99_ms": float(np.percentile(ms, 99)),
+            "peak_kb": timer.peaks.get(stage, 0) / 1024,
+        }
+    return report
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(model_path=DEFAULT_MODEL, repeats=5):
+    with tempfile.TemporaryDirectory() as tmp:
+        clips = make_clips(tmp)
+        tts_cache = TTSCache(os.path.join(tmp, "tts"), synthesizer=tone_synthesize,
+                             ext=".wav", streamer=None)
+
+        # Warm-up pass (imports, filterbank caches, graph tracing), not recorded
+        run_pass(clips[:1], model_path, StageTimer(), tts_cache, model_loads=1)
+
+        # Timing passes without tracemalloc, whose hooks would slow allocations down
+        timer = StageTimer()
+        for _ in range(repeats):
+            run_pass(clips, model_path, timer, tts_cache, model_loads=1)
+
+        # One separate pass for memory peaks
+        memory = StageTimer(track_memory=True)
+        tracemalloc.start()
+        try:
+            run_pass(clips, model_path, memory, tts_cache, model_loads=1)
+        finally:
+            tracemalloc.stop()
+
+    timer.peaks = memory.peaks
+    report = summarize(timer)
+
+    print(f"\n⏱ {len(clips)} clips ({', '.join(f'{s:g}s' for s in SECONDS)} x "
+          f"{', '.join(str(r) for r in SAMPLE_RATES)} Hz), {repeats} passes\n")
+    print(f"{'stage':14s} {'n':>5s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'peak KB':>9s}")
+    for stage, r in report.items():
+        print(f"{stage:14s} {r['n']:>5d} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+              f"{r['p99_ms']:>9.2f} {r['peak_kb']:>9.0f}")
+    rss = _peak_rss_mb()
+    if rss is not None:
+        print(f"\npeak RSS: {rss:.0f} MB")
+    return report
+
+
+def compare(report, baseline, threshold=0.25):
+    """Return [(stage, baseline_p50, p50)] for stages slower than baseline by more than threshold."""
+    regressions = []
+    for stage, r in report.items():
+        base = baseline.get(stage)
+        if base and r["p50_ms"] > base["p50_ms"] * (1 + threshold):
+            regressions.append((stage, base["p50_ms"], r["p50_ms"]))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed p50 slowdown vs baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    report = run(args.model, args.repeats)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"✔ Baseline saved to {args.baseline}")
+
+    if args.compare:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for stage, before, after in regressions:
+            print(f"❌ {stage}: p50 {before:.2f} ms → {after:.2f} ms "
+                  f"(+{(after / before - 1) * 100:.0f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"✔ No stage regressed more than {args.threshold:.0%} vs {args.baseline}")
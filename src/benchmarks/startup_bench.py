@@ -0,0 +1,94 @@
+"""
+Cold-start benchmark: import cost of the app's modules and time to first prediction.
+
+Every measurement runs in a fresh interpreter so nothing is already imported.
+Run from src/:  python -m benchmarks.startup_bench [--model models/emotion_model.h5] [--json out.json]
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORTS = [
+    "streamlit",
+    "utils.emotion_responder",
+    "utils.user_name_memory",
+    "features.mfcc_extractor",
+    "models.predict",
+    "utils.tts_engine",
+    "tensorflow",
+]
+
+FIRST_PREDICTION = """
+import time, json
+t0 = time.perf_counter()
+import numpy as np, io, soundfile as sf
+from models.predict import get_classifier
+t_import = time.perf_counter()
+clf = get_classifier({model!r})
+clf.load()
+t_load = time.perf_counter()
+buf = io.BytesIO()
+sf.write(buf, (np.random.default_rng(0).standard_normal(16000 * 3) * 0.1).astype("float32"), 16000, format="WAV")
+clf.predict_file(buf.getvalue())
+t_pred = time.perf_counter()
+print(json.dumps({{"import": t_import - t0, "model_load": t_load - t_import,
+                  "first_predict": t_pred - t_load, "total": t_pred - t0}}))
+"""
+
+
+def _run(code):
+    out = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, capture_output=True,
+                         text=True, env={**os.environ, "TF_CPP_MIN_LOG_LEVEL": "3"})
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1] if out.stderr else "failed")
+    return out.stdout.strip().splitlines()[-1]
+
+
+def time_import(module):
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    return float(_run(code))
+
+
+def time_first_prediction(model_path):
+    return json.loads(_run(FIRST_PREDICTION.format(model=model_path)))
+
+
+def run(model_path="models/emotion_model.h5"):
+    results = {"imports": {}, "first_prediction": None}
+
+    print("\n⏱ Cold import time (fresh interpreter each)\n")
+    for module in IMPORTS:
+        try:
+            seconds = time_import(module)
+            results["imports"][module] = seconds
+            print(f"{module:28s} {seconds * 1000:9.1f} ms")
+        except RuntimeError as e:
+            print(f"{module:28s}   skipped ({e})")
+
+    print("\n⏱ Time to first prediction\n")
+    try:
+        first = time_first_prediction(model_path)
+        results["first_prediction"] = first
+        for stage, seconds in first.items():
+            print(f"{stage:28s} {seconds * 1000:9.1f} ms")
+    except RuntimeError as e:
+        print("skipped:", e)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default="models/emotion_model.h5")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = run(args.model)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,128 @@
+"""
+Model variant benchmark: parameters, CPU latency and validation accuracy.
+
+For every architecture in models.build_model.VARIANTS this loads its
+checkpoint (models/emotion_model[_<variant>].h5), training it first if it
+is missing or --epochs is given. It then reports:
+  - parameter count
+  - CPU inference latency (median and p95 of model(x)) at batch 1 / 8 / 64
+  - validation accuracy on the held-out 20% split train_model uses
+and picks the fastest variant at batch 1 that meets --min-accuracy.
+
+Run from src/:
+    python -m benchmarks.variant_bench [--min-accuracy 0.6] [--epochs 15] [--variants lstm tcn]
+"""
+
+import os
+import json
+import time
+import argparse
+import numpy as np
+
+# Benchmark on CPU only, whatever the box has
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+
+from sklearn.model_selection import train_test_split
+
+from models import train_model
+from models.build_model import VARIANTS
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(SRC_DIR, "models")
+DEFAULT_OUT = os.path.join(os.path.dirname(SRC_DIR), "data", "reports", "variant_report.json")
+BATCH_SIZES = (1, 8, 64)
+
+
+def checkpoint_path(variant):
+    return os.path.join(MODELS_DIR, train_model.model_filename(variant))
+
+
+def time_model(model, batch_size, repeats=30):
+    """(median, p95) seconds for one forward pass of a batch_size batch."""
+    x = np.random.default_rng(0).standard_normal(
+        (batch_size, train_model.MAX_PAD_LEN, train_model.N_MFCC)).astype(np.float32)
+    model(x, training=False)  # build/trace outside the timed loop
+
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model(x, training=False)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)), float(np.percentile(times, 95))
+
+
+def validation_accuracy(model, batch_size=64):
+    X, y = train_model.open_packed()
+    _, test_idx = train_test_split(np.arange(len(y)), test_size=0.2, random_state=42)
+    # Bucketed like training's validation set, so the accuracies match
+    val_ds = train_model.make_tf_dataset(X, y, test_idx, batch_size=batch_size,
+                                         lengths=train_model.open_lengths())
+    _, accuracy = model.evaluate(val_ds, verbose=0)
+    return float(accuracy)
+
+
+def bench_variant(variant, epochs=None, repeats=30):
+    from tensorflow.keras.models import load_model
+
+    path = checkpoint_path(variant)
+    if epochs or not os.path.exists(path):
+        train_model.train(variant=variant, epochs=epochs or 15, model_path=path)
+
+    model = load_model(path)
+    row = {
+        "variant": variant,
+        "params": int(model.count_params()),
+        "val_accuracy": validation_accuracy(model),
+    }
+    for batch_size in BATCH_SIZES:
+        median, p95 = time_model(model, batch_size, repeats)
+        row[f"b{batch_size}_ms"] = median * 1000
+        row[f"b{batch_size}_p95_ms"] = p95 * 1000
+        row[f"b{batch_size}_clips_per_s"] = batch_size / median
+    return row
+
+
+def select(rows, min_accuracy):
+    """Fastest variant at batch 1 whose validation accuracy meets min_accuracy, or None."""
+    eligible = [r for r in rows if r["val_accuracy"] >= min_accuracy]
+    return min(eligible, key=lambda r: r["b1_ms"]) if eligible else None
+
+
+def run(variants=None, min_accuracy=0.6, epochs=None, repeats=30, out=DEFAULT_OUT):
+    rows = []
+    for variant in variants or list(VARIANTS):
+        print(f"⏱ {variant} ...")
+        rows.append(bench_variant(variant, epochs, repeats))
+
+    print(f"\n{'variant':10s} {'params':>10s} {'val_acc':>8s} "
+          + " ".join(f"{'b' + str(b) + ' ms':>9s}" for b in BATCH_SIZES))
+    for r in rows:
+        print(f"{r['variant']:10s} {r['params']:>10,d} {r['val_accuracy']:>8.3f} "
+              + " ".join(f"{r[f'b{b}_ms']:>9.2f}" for b in BATCH_SIZES))
+
+    choice = select(rows, min_accuracy)
+    if choice:
+        print(f"\n✔ Fastest variant with val_accuracy >= {min_accuracy}: {choice['variant']} "
+              f"({choice['b1_ms']:.2f} ms at batch 1) → train with --variant {choice['variant']}")
+    else:
+        print(f"\n❌ No variant reaches val_accuracy {min_accuracy}")
+
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump({"min_accuracy": min_accuracy, "selected": choice and choice["variant"],
+                   "variants": rows}, f, indent=2)
+    print(f"Report written to {out}")
+    return choice
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the model variants")
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANTS))
+    parser.add_argument("--min-accuracy", type=float, default=0.6)
+    parser.add_argument("--epochs", type=int,
+                        help="(re)train every variant for this many epochs first")
+    parser.add_argument("--repeats", type=int, default=30)
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    args = parser.parse_args()
+
+    run(args.variants, args.min_accuracy, args.epochs, args.repeats, args.out)
@@ -0,0 +1,57 @@
+import io
+import os
+from math import gcd
+import numpy as np
+import soundfile as sf
+
+DEFAULT_SR = 22050
+
+
+def _to_mono(audio):
+    if audio.ndim == 2:
+        audio = audio.mean(axis=1)
+    return audio.astype(np.float32, copy=False)
+
+
+def resample(audio, orig_sr, target_sr):
+    """Polyphase resampling (e.g. 16000 -> 22050 is up 441 / down 320), float32 in and out."""
+    if orig_sr == target_sr:
+        return audio
+    from scipy.signal import resample_poly  # scipy.signal takes ~1s to import
+    g = gcd(int(orig_sr), int(target_sr))
+    out = resample_poly(audio, int(target_sr) // g, int(orig_sr) // g)
+    return out.astype(np.float32, copy=False)
+
+
+def load_audio(source, sr=DEFAULT_SR, source_sr=None):
+    """Decode audio to a mono float32 signal at sr. Returns (audio, sr).
+
+    source can be:
+      - a file path (str / PathLike)
+      - raw encoded bytes (bytes, bytearray, memoryview), e.g. WAV from the browser recorder
+      - a binary file-like object
+      - a numpy array of samples at source_sr (defaults to sr), or an (array, source_sr) tuple
+
+    Bytes and file-like objects are decoded in memory; nothing touches the disk.
+    """
+    if isinstance(source, tuple):
+        source, source_sr = source
+
+    if isinstance(source, np.ndarray):
+        audio = _to_mono(source)
+        return resample(audio, source_sr or sr, sr), sr
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(bytes(source))
+
+    try:
+        audio, file_sr = sf.read(source, dtype="float32", always_2d=True)
+    except Exception:
+        # Formats libsndfile can't read (mp3/webm…): let librosa/audioread try, paths only.
+        if not isinstance(source, (str, os.PathLike)):
+            raise
+        import librosa
+        audio, _ = librosa.load(source, sr=sr, res_type="polyphase")
+        return audio.astype(np.float32, copy=False), sr
+
+    return resample(_to_mono(audio), file_sr, sr), sr
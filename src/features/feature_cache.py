@@ -0,0 +1,115 @@
+import os
+import json
+import hashlib
+import numpy as np
+
+# -------------------------------------------------------
+# On-disk MFCC cache.
+# Entries are keyed by a hash of the audio file *content* plus the
+# extractor parameters, so an edited file or a changed parameter simply
+# misses and recomputes — no explicit invalidation needed.
+# -------------------------------------------------------
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "feature_cache")
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GB
+
+
+def file_digest(file_path, block_size=1 << 20):
+    h = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class FeatureCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._bytes = None  # total size on disk, computed lazily
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, file_path, params):
+        params_blob = json.dumps(params, sort_keys=True).encode("utf-8")
+        h = hashlib.sha1(file_digest(file_path).encode("ascii"))
+        h.update(params_blob)
+        return h.hexdigest()
+
+    def _entry_path(self, key):
+        # Two-level sharding keeps directories small.
+        return os.path.join(self.cache_dir, key[:2], key + ".npy")
+
+    def get(self, key):
+        path = self._entry_path(key)
+        try:
+            features = np.load(path)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # mark as recently used for LRU eviction
+        except OSError:
+            pass
+        return features
+
+    def put(self, key, features):
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temp file first so concurrent readers never see half a file.
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, np.asarray(features, dtype=np.float32))
+        os.replace(tmp_path, path)
+
+        if self._bytes is None:
+            self._bytes = self._scan_size()
+        else:
+            self._bytes += os.path.getsize(path)
+
+        if self._bytes > self.max_bytes:
+            self.evict()
+
+    def get_or_compute(self, file_path, params, compute_fn):
+        """Return cached features for file_path, computing and storing them on a miss."""
+        key = self.key(file_path, params)
+        features = self.get(key)
+        if features is not None:
+            return features
+
+        features = compute_fn(file_path)
+        if features is not None:
+            self.put(key, features)
+        return features
+
+    def _entries(self):
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".npy"):
+                    yield entry
+
+    def _scan_size(self):
+        return sum(e.stat().st_size for e in self._entries())
+
+    def evict(self):
+        """Delete least-recently-used entries until the cache is below 90% of max_bytes."""
+        entries = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in self._entries()]
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+        self._bytes = total
+
+    def clear(self):
+        for entry in list(self._entries()):
+            os.remove(entry.path)
+        self._bytes = 0
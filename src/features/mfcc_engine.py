@@ -0,0 +1,158 @@
+"""
+Shared MFCC engine used by training, inference and live streaming.
+
+A NumPy/SciPy re-implementation of librosa.feature.mfcc with librosa's
+defaults (n_fft=2048, hop 512, 128 Slaney mel bands, power_to_db with
+top_db=80, orthonormal DCT-II). The mel filterbank, DCT matrix and window
+are built once and cached; a batch of equal-length signals is processed as
+one vectorized STFT -> mel -> dB -> DCT computation in float32.
+"""
+
+from functools import lru_cache
+import numpy as np
+import scipy.fft
+
+from features.audio_io import load_audio
+
+# Bump when the numbers this engine produces change (used in cache keys).
+ENGINE_VERSION = 1
+
+SAMPLE_RATE = 22050
+N_MFCC = 40
+N_FFT = 2048
+HOP_LENGTH = 512
+N_MELS = 128
+TOP_DB = 80.0
+AMIN = 1e-10
+
+
+def _hz_to_mel(freqs):
+    # Slaney scale: linear below 1 kHz, logarithmic above (librosa's htk=False)
+    freqs = np.asarray(freqs, dtype=np.float64)
+    f_sp = 200.0 / 3
+    min_log_hz = 1000.0
+    min_log_mel = min_log_hz / f_sp
+    logstep = np.log(6.4) / 27.0
+
+    mels = freqs / f_sp
+    log_t = freqs >= min_log_hz
+    mels[log_t] = min_log_mel + np.log(freqs[log_t] / min_log_hz) / logstep
+    return mels
+
+
+def _mel_to_hz(mels):
+    mels = np.asarray(mels, dtype=np.float64)
+    f_sp = 200.0 / 3
+    min_log_hz = 1000.0
+    min_log_mel = min_log_hz / f_sp
+    logstep = np.log(6.4) / 27.0
+
+    freqs = f_sp * mels
+    log_t = mels >= min_log_mel
+    freqs[log_t] = min_log_hz * np.exp(logstep * (mels[log_t] - min_log_mel))
+    return freqs
+
+
+@lru_cache(maxsize=None)
+def mel_filterbank(sr=SAMPLE_RATE, n_fft=N_FFT, n_mels=N_MELS, fmin=0.0, fmax=None):
+    """(n_mels, 1 + n_fft // 2) Slaney-normalized mel filterbank, same as librosa.filters.mel."""
+    if fmax is None:
+        fmax = sr / 2.0
+
+    fftfreqs = np.fft.rfftfreq(n=n_fft, d=1.0 / sr)
+    mel_f = _mel_to_hz(np.linspace(_hz_to_mel([fmin])[0], _hz_to_mel([fmax])[0], n_mels + 2))
+
+    fdiff = np.diff(mel_f)
+    ramps = np.subtract.outer(mel_f, fftfreqs)
+    lower = -ramps[:-2] / fdiff[:-1, None]
+    upper = ramps[2:] / fdiff[1:, None]
+    weights = np.maximum(0, np.minimum(lower, upper))
+
+    enorm = 2.0 / (mel_f[2:n_mels + 2] - mel_f[:n_mels])
+    weights *= enorm[:, None]
+
+    weights = weights.astype(np.float32)
+    weights.setflags(write=False)
+    return weights
+
+
+@lru_cache(maxsize=None)
+def dct_matrix(n_mfcc=N_MFCC, n_mels=N_MELS):
+    """(n_mfcc, n_mels) orthonormal DCT-II matrix (first n_mfcc rows)."""
+    k = np.arange(n_mfcc)[:, None]
+    n = np.arange(n_mels)[None, :]
+    basis = np.cos(np.pi * k * (2 * n + 1) / (2.0 * n_mels)) * np.sqrt(2.0 / n_mels)
+    basis[0] /= np.sqrt(2.0)
+
+    basis = basis.astype(np.float32)
+    basis.setflags(write=False)
+    return basis
+
+
+@lru_cache(maxsize=None)
+def hann_window(n_fft=N_FFT):
+    window = (0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(n_fft) / n_fft)).astype(np.float32)
+    window.setflags(write=False)
+    return window
+
+
+def mfcc_batch(signals, sr=SAMPLE_RATE, n_mfcc=N_MFCC, n_fft=N_FFT, hop_length=HOP_LENGTH,
+               n_mels=N_MELS, center=True):
+    """MFCCs for a (batch, samples) array of equal-length signals.
+
+    Returns (batch, n_mfcc, frames) float32, matching librosa.feature.mfcc
+    applied to each signal separately.
+    """
+    signals = np.asarray(signals, dtype=np.float32)
+    if signals.ndim == 1:
+        signals = signals[None, :]
+
+    if center:
+        pad = n_fft // 2
+        signals = np.pad(signals, ((0, 0), (pad, pad)))
+
+    if signals.shape[1] < n_fft:
+        raise ValueError(f"signal too short: {signals.shape[1]} samples < n_fft={n_fft}")
+
+    # (batch, frames, n_fft) strided view, then one windowed real FFT
+    frames = np.lib.stride_tricks.sliding_window_view(signals, n_fft, axis=1)[:, ::hop_length]
+    batch, n_frames = frames.shape[:2]
+    spectrum = scipy.fft.rfft(frames * hann_window(n_fft), axis=-1)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+
+    # Flatten to 2-D so each projection is a single GEMM
+    power = power.reshape(batch * n_frames, -1)
+    mel = power @ mel_filterbank(sr, n_fft, n_mels).T         # (batch*frames, n_mels)
+
+    log_mel = 10.0 * np.log10(np.maximum(mel, AMIN)).reshape(batch, n_frames, n_mels)
+    floor = log_mel.max(axis=(1, 2), keepdims=True) - TOP_DB  # per-signal top_db clamp
+    log_mel = np.maximum(log_mel, floor).reshape(batch * n_frames, n_mels)
+
+    coeffs = (log_mel @ dct_matrix(n_mfcc, n_mels).T).reshape(batch, n_frames, n_mfcc)
+    return np.ascontiguousarray(coeffs.transpose(0, 2, 1), dtype=np.float32)
+
+
+def mfcc(signal, sr=SAMPLE_RATE, n_mfcc=N_MFCC, **kwargs):
+    """MFCCs (n_mfcc, frames) for one 1-D signal."""
+    return mfcc_batch(np.asarray(signal)[None, :], sr=sr, n_mfcc=n_mfcc, **kwargs)[0]
+
+
+def pad_or_truncate(features, max_len):
+    """Zero-pad or cut the last (time) axis to max_len frames."""
+    frames = features.shape[-1]
+    if frames < max_len:
+        pad = [(0, 0)] * (features.ndim - 1) + [(0, max_len - frames)]
+        return np.pad(features, pad, mode="constant")
+    return features[..., :max_len]
+
+
+def compute_mfcc(source, sr=SAMPLE_RATE, n_mfcc=N_MFCC, max_pad_len=200, source_sr=None):
+    """Decode source (see audio_io.load_audio) and return padded MFCCs (n_mfcc, max_pad_len).
+
+    max_pad_len=None returns every frame, unpadded. Raises on undecodable input.
+    """
+    audio, sr = load_audio(source, sr=sr, source_sr=source_sr)
+    features = mfcc(audio, sr=sr, n_mfcc=n_mfcc)
+    if max_pad_len is None:
+        return features
+    return pad_or_truncate(features, max_pad_len)
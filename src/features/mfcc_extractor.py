@@ -1,20 +1,124 @@
-import librosa
+import os
+from collections import namedtuple
 import numpy as np
+from features.mfcc_engine import compute_mfcc, mfcc, pad_or_truncate, SAMPLE_RATE
+from features.audio_io import load_audio
+from utils import metrics
 
-def extract_mfcc(file_path, n_mfcc=40, max_pad_len=200):
-    try:
-        audio, sample_rate = librosa.load(file_path, res_type='kaiser_fast')
-        mfcc = librosa.feature.mfcc(y=audio, sr=sample_rate, n_mfcc=n_mfcc)
+# Voice-activity trimming before MFCC (MOOD_VAD=1 turns it on by default).
+# Off by default: the shipped model was trained on untrimmed clips.
+VAD = os.environ.get("MOOD_VAD", "0") == "1"
 
-        # Pad or truncate to fixed length
-        if mfcc.shape[1] < max_pad_len:
-            pad_width = max_pad_len - mfcc.shape[1]
-            mfcc = np.pad(mfcc, pad_width=((0, 0), (0, pad_width)), mode='constant')
-        else:
-            mfcc = mfcc[:, :max_pad_len]
+VadStats = namedtuple("VadStats", "total_samples kept_samples skipped_samples")
+
+
+def _frame_sums(values, frame, hop, n_frames):
+    """Sum of values over each (frame, hop) window, via one cumulative sum."""
+    cs = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    starts = np.arange(n_frames) * hop
+    return cs[starts + frame] - cs[starts]
+
+
+def _runs(mask):
+    """(starts, ends) of the runs of True in a 1-D bool array; ends are exclusive."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def voice_activity(audio, sr=SAMPLE_RATE, frame_ms=25, hop_ms=10, threshold_db=-35.0,
+                   floor_db=-55.0, zcr_threshold=0.25, hangover_ms=150):
+    """Per-frame speech mask from short-time energy and zero-crossing rate.
+
+    A frame is speech if its energy is within threshold_db of the loudest
+    frame (and above floor_db absolute), or slightly quieter but with a high
+    zero-crossing rate (unvoiced consonants like s/f/sh). The mask is then
+    widened by hangover_ms on both sides so word edges aren't clipped.
+    Returns (mask, frame, hop); frame i covers samples [i*hop, i*hop + frame).
+    """
+    frame = max(1, int(sr * frame_ms / 1000))
+    hop = max(1, int(sr * hop_ms / 1000))
+    if len(audio) < frame:
+        return np.ones(1, dtype=bool), frame, hop
+
+    n_frames = 1 + (len(audio) - frame) // hop
+    audio = np.asarray(audio, dtype=np.float32)
+
+    energy = _frame_sums(audio * audio, frame, hop, n_frames) / frame
+    energy_db = 10.0 * np.log10(np.maximum(energy, 1e-10))
+    crossings = np.concatenate(([0], np.signbit(audio[1:]) != np.signbit(audio[:-1])))
+    zcr = _frame_sums(crossings, frame, hop, n_frames) / frame
+
+    level = max(energy_db.max() + threshold_db, floor_db)
+    speech = (energy_db > level) | ((energy_db > level - 10.0) & (zcr > zcr_threshold))
+
+    hang = int(hangover_ms / hop_ms)
+    if hang and speech.any():
+        # "full" then slice: mode="same" returns max(n_frames, 2*hang+1) values
+        widened = np.convolve(speech, np.ones(2 * hang + 1), mode="full")
+        speech = widened[hang:hang + n_frames] > 0
+    return speech, frame, hop
 
-        return mfcc
+
+def trim_silence(audio, sr=SAMPLE_RATE, max_pause_ms=400, **vad_kwargs):
+    """Drop leading/trailing silence and shorten internal pauses to max_pause_ms.
+
+    max_pause_ms=None keeps internal pauses as they are. If no speech is
+    found the audio is returned unchanged. Returns (audio, VadStats).
+    """
+    audio = np.asarray(audio, dtype=np.float32)
+    speech, frame, hop = voice_activity(audio, sr, **vad_kwargs)
+    total = len(audio)
+
+    starts, ends = _runs(speech)
+    if len(starts) == 0:
+        return audio, VadStats(total, total, 0)
+
+    seg_starts = starts * hop
+    seg_ends = np.minimum((ends - 1) * hop + frame, total)
+
+    if max_pause_ms is None:
+        out = audio[seg_starts[0]:seg_ends[-1]]
+    else:
+        # Keep every speech run plus up to max_pause_ms of the gap after it
+        # (clamped at the next run, so overlapping frames aren't duplicated)
+        max_pause = int(sr * max_pause_ms / 1000)
+        seg_ends[:-1] = np.minimum(seg_ends[:-1] + max_pause, seg_starts[1:])
+        out = np.concatenate([audio[s:e] for s, e in zip(seg_starts, seg_ends)])
+
+    return out, VadStats(total, len(out), total - len(out))
+
+
+def extract_mfcc(source, n_mfcc=40, max_pad_len=200, source_sr=None, vad=None,
+                 return_vad_stats=False):
+    """MFCCs (n_mfcc, max_pad_len) for a file path, encoded bytes, file-like object or ndarray.
+
+    See features.audio_io.load_audio for the accepted sources; source_sr is
+    only used for raw ndarray input. max_pad_len=None keeps every frame
+    (variable length, for EmotionClassifier.predict).
+
+    vad=True (default: MOOD_VAD) trims silence with trim_silence() before the
+    MFCCs, so the 200 frames hold speech instead of pauses. Skipped samples
+    are counted in the vad_skipped_samples metric; return_vad_stats=True also
+    returns (mfcc, VadStats).
+    """
+    vad = VAD if vad is None else vad
+    stats = None
+    try:
+        if not vad:
+            features = compute_mfcc(source, n_mfcc=n_mfcc, max_pad_len=max_pad_len,
+                                    source_sr=source_sr)
+        else:
+            audio, sr = load_audio(source, sr=SAMPLE_RATE, source_sr=source_sr)
+            audio, stats = trim_silence(audio, sr)
+            metrics.inc("vad_skipped_samples", stats.skipped_samples)
+            metrics.inc("vad_total_samples", stats.total_samples)
+            features = mfcc(audio, sr=sr, n_mfcc=n_mfcc)
+            if max_pad_len is not None:
+                features = pad_or_truncate(features, max_pad_len)
 
     except Exception as e:
-        print(f"❌ MFCC extraction failed for {file_path}: {e}")
-        return None
+        name = source if isinstance(source, str) else type(source).__name__
+        print(f"❌ MFCC extraction failed for {name}: {e}")
+        features = None
+
+    return (features, stats) if return_vad_stats else features
@@ -0,0 +1,131 @@
+"""
+inference_client.py
+Client for inference_server.py with in-process fallback.
+
+get_predictor() is what the apps call instead of models.predict.get_classifier:
+  - MOOD_INFERENCE_URL unset: the in-process EmotionClassifier, as before
+  - set (e.g. http://127.0.0.1:8765): an InferenceClient with the same
+    load()/predict()/predict_file() API that sends work to the shared server
+
+If the server is unreachable, overloaded (503) or errors, the client answers
+from a local EmotionClassifier instead, and skips the server for
+retry_after seconds so a dead server doesn't cost a timeout per call.
+"""
+
+import io
+import os
+import json
+import time
+import threading
+import urllib.request
+import urllib.error
+
+import numpy as np
+
+from models.predict import get_classifier
+
+INFERENCE_URL = os.environ.get("MOOD_INFERENCE_URL")
+TIMEOUT_S = float(os.environ.get("MOOD_INFERENCE_TIMEOUT", "5"))
+
+
+class InferenceClient:
+    def __init__(self, url, model_path="emotion_model.h5", timeout=TIMEOUT_S, retry_after=5.0):
+        self.url = url.rstrip("/")
+        self.model_path = model_path
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def fallback(self):
+        """The local classifier, created (and its model loaded) only when needed."""
+        return get_classifier(self.model_path)
+
+    def _post(self, body, content_type):
+        headers = {"Content-Type": content_type,
+                   "X-Model-Path": os.path.abspath(self.model_path)}
+        request = urllib.request.Request(self.url + "/predict", data=body, method="POST",
+                                         headers=headers)
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            result = json.loads(response.read())
+        return result["emotion"], np.asarray(result["probs"], dtype=np.float32)
+
+    def _remote(self, body, content_type):
+        """(emotion, probs) from the server, or None if it should be skipped/failed."""
+        if time.monotonic() < self._down_until:
+            return None
+        try:
+            return self._post(body, content_type)
+        except urllib.error.HTTPError as e:
+            # 503 = server busy: answer locally this time, but keep using it
+            if e.code == 409:
+                # The server serves a different model: never use it for this one
+                print(f"⚠️ Inference server has a different model than {self.model_path}, "
+                      f"using local model")
+                with self._lock:
+                    self._down_until = float("inf")
+            elif e.code != 503:
+                print(f"⚠️ Inference server error {e.code}, using local model")
+        except (urllib.error.URLError, OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Inference server unavailable ({e}), using local model "
+                  f"for {self.retry_after:.0f}s")
+            with self._lock:
+                self._down_until = time.monotonic() + self.retry_after
+        return None
+
+    def healthy(self):
+        try:
+            with urllib.request.urlopen(self.url + "/health", timeout=self.timeout) as response:
+                return json.loads(response.read()).get("ok", False)
+        except (urllib.error.URLError, OSError, ValueError):
+            return False
+
+    def load(self):
+        """Check the server; load the local model only if it is not reachable. Returns self."""
+        if not self.healthy():
+            print("⚠️ Inference server not reachable, loading the local model")
+            try:
+                self.fallback.load()
+            except Exception as e:
+                # fallback.predict() answers with random output, same as the local path
+                print("⚠️ Could not load model:", e)
+        return self
+
+    def predict(self, mfcc):
+        """Same as EmotionClassifier.predict: MFCCs (40, frames) -> (emotion, probs)."""
+        buf = io.BytesIO()
+        np.save(buf, np.asarray(mfcc, dtype=np.float32), allow_pickle=False)
+        result = self._remote(buf.getvalue(), "application/x-npy")
+        return result if result is not None else self.fallback.predict(mfcc)
+
+    def predict_file(self, source):
+        """Encoded audio bytes or a file path; the server decodes and extracts features."""
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as f:
+                data = f.read()
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            data = bytes(source)
+        else:
+            return self.fallback.predict_file(source)
+
+        result = self._remote(data, "application/octet-stream")
+        return result if result is not None else self.fallback.predict_file(data)
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_predictor(model_path="emotion_model.h5", url=None):
+    """The server client when MOOD_INFERENCE_URL (or url) is set, else the local classifier."""
+    url = url or INFERENCE_URL
+    if not url:
+        return get_classifier(model_path)
+
+    with _clients_lock:
+        client = _clients.get((url, model_path))
+        if client is None:
+            client = _clients[(url, model_path)] = InferenceClient(url, model_path)
+        return client
+
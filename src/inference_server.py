@@ -0,0 +1,261 @@
+"""
+inference_server.py
+Local micro-batching inference service shared by every app process/session.
+
+One process owns the model. Concurrent requests are queued and coalesced
+into micro-batches: the batcher takes the first waiting request, then keeps
+collecting until max_batch requests or max_wait_ms have passed, and runs the
+whole batch in one model call. The queue is bounded; when it is full the
+server answers 503 right away (backpressure) instead of piling up latency.
+
+Endpoints (HTTP on 127.0.0.1):
+  POST /predict   body: encoded audio (any Content-Type), or MFCCs as .npy
+                  (Content-Type: application/x-npy, shape (40, frames))
+                  -> {"ok": true, "emotion": ..., "probs": [...], "batch_size": n, "wait_ms": ...}
+                  An X-Model-Path header naming another model than the one
+                  served is answered 409 (the client then predicts locally).
+  GET  /health    -> {"ok": true, "model_loaded": bool}
+  GET  /stats     -> queue depth, batch-size histogram, request/reject counts
+  GET  /metrics   -> Prometheus text (with MOOD_METRICS=1)
+
+Run from src/:
+    python inference_server.py [--port 8765] [--max-batch 32] [--max-wait-ms 10] [--max-queue 256]
+and point the apps at it with MOOD_INFERENCE_URL=http://127.0.0.1:8765
+(see inference_client.py; they fall back to in-process inference if it is down).
+"""
+
+import io
+import os
+import json
+import time
+import queue
+import argparse
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import numpy as np
+
+from features.mfcc_extractor import extract_mfcc
+from features.mfcc_engine import N_MFCC
+from models.predict import get_classifier, EMOTIONS
+from utils import metrics
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "emotion_model.h5")
+DEFAULT_PORT = 8765
+
+
+class Overloaded(Exception):
+    pass
+
+
+class MicroBatcher:
+    """Coalesces concurrent predict requests into batched model calls on one thread."""
+
+    def __init__(self, classifier, max_batch=32, max_wait_ms=10, max_queue=256):
+        self.classifier = classifier
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._requests = self._rejected = self._batches = self._errors = 0
+        self._wait_total = 0.0
+        self._thread = threading.Thread(target=self._loop, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, features):
+        """Queue (frames, 40) features; returns a Future of (probs, batch_size, wait_s)."""
+        future = Future()
+        try:
+            self._queue.put_nowait((features, future, time.perf_counter()))
+        except queue.Full:
+            with self._stats_lock:
+                self._rejected += 1
+            metrics.inc("server_rejected")
+            raise Overloaded(f"queue full ({self._queue.maxsize} waiting)")
+        with self._stats_lock:
+            self._requests += 1
+        return future
+
+    def _collect(self):
+        items = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(items) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                items.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return items
+
+    def _loop(self):
+        while True:
+            items = self._collect()
+            started = time.perf_counter()
+            try:
+                results = self._run_batch([features for features, _, _ in items])
+            except Exception:
+                # Don't let one request fail the whole batch: retry each on its own
+                results = []
+                for features, _, _ in items:
+                    try:
+                        results.append(self._run_batch([features])[0])
+                    except Exception as e:
+                        results.append(e)
+
+            waits = [started - queued for _, _, queued in items]
+            errors = sum(isinstance(r, Exception) for r in results)
+            with self._stats_lock:
+                self._batches += 1
+                self._errors += errors
+                self._batch_sizes[len(items)] += 1
+                self._wait_total += sum(waits)
+            metrics.inc("server_batches")
+            metrics.inc("server_batched_requests", len(items))
+            for (_, future, _), result, wait in zip(items, results, waits):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result((result, len(items), wait))
+
+    def _run_batch(self, batch):
+        """One pass over every window of every request; returns per-request mean probs.
+
+        Requests of different lengths share a model call only when padding
+        is masked (see EmotionClassifier.window_probs), so a result never
+        depends on which requests it was batched with.
+        """
+        model = self.classifier.loaded_model()
+        return self.classifier.window_probs(model, batch, batch_size=max(self.max_batch, 32))
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue": self._queue.maxsize,
+                "max_batch": self.max_batch,
+                "max_wait_ms": self.max_wait * 1000,
+                "requests": self._requests,
+                "rejected": self._rejected,
+                "errors": self._errors,
+                "batches": self._batches,
+                "mean_batch_size": (sum(k * v for k, v in self._batch_sizes.items())
+                                    / max(self._batches, 1)),
+                "batch_sizes": {str(k): v for k, v in sorted(self._batch_sizes.items())},
+                "mean_wait_ms": self._wait_total * 1000 / max(self._requests, 1),
+            }
+
+
+class InferenceHandler(BaseHTTPRequestHandler):
+    batcher = None      # set by serve()
+    model_paths = ()    # paths clients may ask for (X-Model-Path), set by serve()
+    timeout_s = 30.0
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 503:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"ok": True,
+                                  "model_loaded": self.batcher.classifier.is_loaded})
+        elif self.path == "/stats":
+            self._send_json(200, dict(self.batcher.stats(), ok=True))
+        elif self.path == "/metrics":
+            body = metrics.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json(404, {"ok": False, "error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(404, {"ok": False, "error": f"unknown path {self.path}"})
+            return
+
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        requested = self.headers.get("X-Model-Path")
+        if requested and os.path.realpath(requested) not in self.model_paths:
+            self._send_json(409, {"ok": False, "error": f"this server serves {self.model_paths[0]}, "
+                                                        f"not {requested}"})
+            return
+        try:
+            if self.headers.get("Content-Type") == "application/x-npy":
+                mfcc = np.load(io.BytesIO(body), allow_pickle=False)
+            else:
+                # Decoding/MFCC runs here, in this request's thread, in parallel
+                with metrics.span("extract_mfcc", app="server"):
+                    mfcc = extract_mfcc(body, max_pad_len=None)
+            if mfcc is None or mfcc.ndim != 2 or mfcc.shape[0] != N_MFCC or mfcc.shape[1] == 0:
+                shape = None if mfcc is None else mfcc.shape
+                raise ValueError(f"expected ({N_MFCC}, frames) features with frames > 0, got {shape}")
+        except Exception as e:
+            self._send_json(400, {"ok": False, "error": str(e)})
+            return
+
+        try:
+            future = self.batcher.submit(np.transpose(mfcc).astype(np.float32))
+            probs, batch_size, wait = future.result(timeout=self.timeout_s)
+        except Overloaded as e:
+            self._send_json(503, {"ok": False, "error": str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {"ok": False, "error": str(e)})
+            return
+
+        self._send_json(200, {
+            "ok": True,
+            "emotion": EMOTIONS[int(np.argmax(probs))],
+            "probs": [float(p) for p in probs],
+            "batch_size": batch_size,
+            "wait_ms": round(wait * 1000, 2),
+        })
+
+    def log_message(self, format, *args):
+        pass  # one line per request is too noisy; see /stats
+
+
+def serve(port=DEFAULT_PORT, model_path=MODEL_PATH, max_batch=32, max_wait_ms=10,
+          max_queue=256, host="127.0.0.1"):
+    classifier = get_classifier(model_path)
+    print("⏳ Loading model...")
+    classifier.load()
+
+    InferenceHandler.batcher = MicroBatcher(classifier, max_batch, max_wait_ms, max_queue)
+    InferenceHandler.model_paths = tuple(dict.fromkeys(
+        os.path.realpath(p) for p in (classifier.model_path, model_path)))
+    server = ThreadingHTTPServer((host, port), InferenceHandler)
+    server.daemon_threads = True
+    print(f"✔ Inference server on http://{host}:{port} "
+          f"(batch ≤ {max_batch}, wait ≤ {max_wait_ms} ms, queue ≤ {max_queue})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-batching emotion inference server")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=10)
+    parser.add_argument("--max-queue", type=int, default=256)
+    args = parser.parse_args()
+
+    serve(args.port, args.model, args.max_batch, args.max_wait_ms, args.max_queue)
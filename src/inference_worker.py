@@ -0,0 +1,222 @@
+"""
+inference_worker.py
+Long-lived backend process for the desktop UI.
+
+Started once by ui_app.py; keeps the model (and TTS player) hot and speaks
+a JSON-lines protocol: one request object per line on stdin, one response
+object per line on stdout. Every response echoes the request "id".
+
+Requests ({"id": ..., "op": ...}):
+  health           -> {"ok": true, "model_loaded": bool, "busy": bool, "uptime_s": float}
+  start_recording  -> {"ok": true, "state": "recording"}
+  stop_recording   -> turn result (see below), sent when the turn finishes
+  predict          -> turn result for {"path": "..."} instead of the microphone
+  cancel           -> {"ok": true}; the running turn answers {"cancelled": true}
+  shutdown         -> {"ok": true}, then the process exits
+
+Turn result:
+  {"ok": true, "emotion": "...", "probs": {...}, "reply": "...",
+   "timings": {"record_stop_ms", "predict_ms", "reply_ms", "tts_ms", "total_ms"}}
+
+Anything the pipeline prints goes to stderr so stdout stays pure protocol.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+
+from features.mfcc_extractor import extract_mfcc
+from models.predict import get_classifier, EMOTIONS
+from utils.emotion_responder import get_response, personalize_reply
+from utils.user_name_memory import get_name
+import audio_recording as ar
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "emotion_model.h5")
+
+
+class Cancelled(Exception):
+    pass
+
+
+class InferenceWorker:
+    def __init__(self, out, model_path=MODEL_PATH):
+        self.out = out
+        self.model_path = model_path
+        self.classifier = get_classifier(model_path)
+        self.started_at = time.monotonic()
+        self._out_lock = threading.Lock()
+        self._recorder = None
+        self._job = None
+        self._cancel = threading.Event()
+
+    # -- protocol ------------------------------------------------------------
+    def send(self, msg):
+        with self._out_lock:
+            self.out.write(json.dumps(msg) + "\n")
+            self.out.flush()
+
+    def handle(self, request):
+        op = request.get("op")
+        rid = request.get("id")
+        handler = getattr(self, f"op_{op}", None)
+        if handler is None:
+            self.send({"id": rid, "ok": False, "error": f"unknown op: {op}"})
+            return True
+        try:
+            return handler(rid, request) is not False
+        except Exception as e:
+            self.send({"id": rid, "ok": False, "error": str(e)})
+            return True
+
+    def serve(self, lines):
+        self.send({"id": None, "ok": True, "event": "ready"})
+        # Load the model in the background so health checks answer immediately
+        threading.Thread(target=self._warm_up, daemon=True).start()
+
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                self.send({"id": None, "ok": False, "error": f"bad request: {e}"})
+                continue
+            if not self.handle(request):
+                break
+
+    def _warm_up(self):
+        try:
+            self.classifier.load()
+        except Exception as e:
+            print("⚠️ Could not load model:", e, file=sys.stderr)
+
+    # -- ops -------------------------------------------------------------------
+    def op_health(self, rid, request):
+        self.send({
+            "id": rid,
+            "ok": True,
+            "model_loaded": self.classifier.is_loaded,
+            "busy": self._busy(),
+            "recording": self._recorder is not None,
+            "uptime_s": round(time.monotonic() - self.started_at, 1),
+        })
+
+    def op_start_recording(self, rid, request):
+        if self._busy() or self._recorder is not None:
+            raise RuntimeError("busy")
+        monitor = ar.StreamingEmotionMonitor(model_path=self.model_path)
+        self._recorder = ar.Recorder(monitor=monitor).start()
+        self._cancel.clear()
+        self.send({"id": rid, "ok": True, "state": "recording"})
+
+    def op_stop_recording(self, rid, request):
+        recorder, self._recorder = self._recorder, None
+        if recorder is None:
+            raise RuntimeError("not recording")
+        self._start_job(rid, self._turn_from_recorder, recorder)
+
+    def op_predict(self, rid, request):
+        if self._busy():
+            raise RuntimeError("busy")
+        self._cancel.clear()
+        self._start_job(rid, self._turn_from_file, request["path"])
+
+    def op_cancel(self, rid, request):
+        self._cancel.set()
+        recorder, self._recorder = self._recorder, None
+        if recorder is not None:
+            recorder.cancel()
+        from utils.tts_engine import stop_speaking
+        stop_speaking()
+        self.send({"id": rid, "ok": True})
+
+    def op_shutdown(self, rid, request):
+        if self._busy() or self._recorder is not None:
+            self.op_cancel(None, request)
+        self.send({"id": rid, "ok": True})
+        return False
+
+    # -- turns -------------------------------------------------------------------
+    def _busy(self):
+        return self._job is not None and self._job.is_alive()
+
+    def _start_job(self, rid, fn, arg):
+        def run():
+            try:
+                self.send(dict(fn(arg), id=rid, ok=True))
+            except Cancelled:
+                self.send({"id": rid, "ok": True, "cancelled": True})
+            except Exception as e:
+                self.send({"id": rid, "ok": False, "error": str(e)})
+
+        self._job = threading.Thread(target=run, daemon=True)
+        self._job.start()
+
+    def _check_cancelled(self):
+        if self._cancel.is_set():
+            raise Cancelled()
+
+    def _turn_from_recorder(self, recorder):
+        t0 = time.perf_counter()
+        path = recorder.stop()
+        t_stop = time.perf_counter()
+        if path is None:
+            raise RuntimeError("nothing was recorded")
+
+        # Live result from the monitor; _finish_turn falls back to the file if it has none
+        emotion, probs = recorder.monitor.latest()
+        return self._finish_turn(path, emotion, probs, t0, t_stop)
+
+    def _turn_from_file(self, path):
+        t0 = time.perf_counter()
+        return self._finish_turn(path, None, None, t0, t0)
+
+    def _finish_turn(self, path, emotion, probs, t0, t_stop):
+        self._check_cancelled()
+        if emotion is None:
+            mfcc = extract_mfcc(path, max_pad_len=None)
+            if mfcc is None:
+                raise RuntimeError("could not extract features")
+            emotion, probs = self.classifier.predict(mfcc)
+        t_pred = time.perf_counter()
+
+        self._check_cancelled()
+        reply = personalize_reply(get_response(emotion), get_name())
+        t_reply = time.perf_counter()
+
+        # Start speaking (non-blocking); the UI gets the result right away
+        from utils.tts_engine import speak
+        try:
+            speak(reply, block=False)
+        except Exception as e:
+            print("⚠️ TTS failed:", e, file=sys.stderr)
+        t_tts = time.perf_counter()
+
+        self._check_cancelled()
+        return {
+            "emotion": emotion,
+            "probs": {e: round(float(p), 4) for e, p in zip(EMOTIONS, probs)},
+            "reply": reply,
+            "audio_path": path,
+            "timings": {
+                "record_stop_ms": round((t_stop - t0) * 1000, 1),
+                "predict_ms": round((t_pred - t_stop) * 1000, 1),
+                "reply_ms": round((t_reply - t_pred) * 1000, 1),
+                "tts_ms": round((t_tts - t_reply) * 1000, 1),
+                "total_ms": round((t_tts - t0) * 1000, 1),
+            },
+        }
+
+
+def main():
+    # Keep the protocol channel for ourselves; route every print() to stderr.
+    protocol_out = sys.stdout
+    sys.stdout = sys.stderr
+    InferenceWorker(protocol_out).serve(sys.stdin)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import numpy as np
+from features.mfcc_engine import mfcc
+from audio_recording import StreamingEmotionMonitor
+
+
+def run_live_mfcc_test():
+    """The live monitor's window must equal mfcc() on the same samples (as in training)."""
+    print("\n🔍 Running LIVE MFCC TEST...\n")
+
+    sr = 22050
+    rng = np.random.default_rng(0)
+    t = np.arange(sr * 7) / sr
+    speech = (0.3 * np.sin(2 * np.pi * 180 * t) * (np.sin(2 * np.pi * 2 * t) > 0)
+              + 0.01 * rng.standard_normal(len(t))).astype(np.float32)
+
+    cases = {
+        # Silent / very quiet lead-in: the top_db floor must come from the whole window
+        "silent lead-in": np.concatenate([np.zeros(sr, np.float32), speech[:2 * sr]]),
+        "quiet lead-in": np.concatenate([np.full(sr, 1e-5, np.float32), speech[:2 * sr]]),
+        "longer than window": speech,
+    }
+
+    ok = True
+    for name, audio in cases.items():
+        monitor = StreamingEmotionMonitor(sample_rate=sr)
+        for start in range(0, len(audio), 1024):   # audio-callback sized blocks
+            monitor.feed(audio[start:start + 1024, None])
+            if start % (sr // 2) < 1024:
+                monitor._new_audio()
+        monitor._new_audio()
+
+        keep = (monitor.window_frames - 1) * monitor.hop_length
+        live = monitor.window_features()
+        offline = mfcc(audio[-keep:], sr=sr)
+        passed = live.shape == offline.shape and np.allclose(live, offline, atol=1e-3)
+        ok &= passed
+        print(f"{'✅' if passed else '❌'} {name:18s} shape={live.shape} "
+              f"c0 live {live[0].min():.0f} / offline {offline[0].min():.0f}")
+
+    # Nothing new since the last update: no second prediction
+    calls = []
+    monitor = StreamingEmotionMonitor(sample_rate=sr)
+    monitor._classifier = type("Stub", (), {"predict": lambda self, m: calls.append(m) or ("happy", None)})()
+    monitor.feed(speech[:sr, None])
+    monitor._update()
+    monitor._update()
+    passed = len(calls) == 1
+    ok &= passed
+    print(f"{'✅' if passed else '❌'} unchanged window is not re-predicted ({len(calls)} call)")
+
+    print("\n-----------------------------")
+    print("LIVE MFCC OK" if ok else "LIVE MFCC FAILED")
+    print("-----------------------------\n")
+    return ok
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_live_mfcc_test() else 1)
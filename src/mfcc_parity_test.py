@@ -0,0 +1,45 @@
+import numpy as np
+import librosa
+from features.mfcc_engine import mfcc, mfcc_batch
+
+def run_parity_test():
+    """Compare the shared MFCC engine against librosa.feature.mfcc."""
+    print("\n🔍 Running MFCC PARITY TEST...\n")
+
+    rng = np.random.default_rng(0)
+    sr = 22050
+    t = np.arange(sr * 3) / sr
+
+    signals = {
+        "noise": rng.standard_normal(sr * 3).astype(np.float32) * 0.1,
+        "sine": (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32),
+        "chirp": (0.3 * np.sin(2 * np.pi * (100 + 2000 * t) * t)).astype(np.float32),
+        "short": rng.standard_normal(3000).astype(np.float32) * 0.1,
+    }
+
+    ok = True
+    for name, y in signals.items():
+        ref = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=40)
+        ours = mfcc(y, sr=sr, n_mfcc=40)
+        err = np.max(np.abs(ref - ours))
+        scale = np.max(np.abs(ref))
+        passed = ref.shape == ours.shape and err <= 1e-3 * scale + 1e-2
+        ok &= passed
+        print(f"{'✅' if passed else '❌'} {name:6s} shape={ours.shape} max|Δ|={err:.2e} (scale {scale:.1f})")
+
+    # Batched result must equal per-signal results
+    batch = np.stack([signals["noise"], signals["sine"], signals["chirp"]])
+    batched = mfcc_batch(batch, sr=sr)
+    single = np.stack([mfcc(y, sr=sr) for y in batch])
+    passed = np.allclose(batched, single, atol=1e-4)
+    ok &= passed
+    print(f"{'✅' if passed else '❌'} batch == per-signal")
+
+    print("\n-----------------------------")
+    print("PARITY OK" if ok else "PARITY FAILED")
+    print("-----------------------------\n")
+    return ok
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_parity_test() else 1)
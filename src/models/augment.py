@@ -0,0 +1,323 @@
+"""
+On-the-fly waveform augmentation for training.
+
+Augmented copies are never written to disk: every epoch, each training batch
+of raw waveforms (from the packed waveform file, see
+train_model.pack_waveforms) gets a fresh random mix of
+
+  - speed   resample by 0.9-1.1x (tempo and pitch change together)
+  - pitch   +-2 semitones at constant tempo (phase-vocoder stretch + resample)
+  - shift   up to +-0.25 s time shift, zero filled
+  - gain    -9..+6 dB, clipped to [-1, 1] like a saturating phone mic
+  - noise   white noise at 10-40 dB SNR
+
+All of them are vectorized over the batch (per-row parameters, no Python
+loop over clips). The augmented batch then goes through the shared
+mfcc_engine.mfcc_batch, so training features come from the same code as
+inference features.
+
+AugmentedBatches runs batches in background worker threads (NumPy/SciPy
+FFT and matmuls release the GIL) with a bounded prefetch window. Every batch
+uses its own RNG seeded from (seed, epoch, batch index), so an epoch is
+identical whatever the number of workers or the order they finish in.
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import scipy.fft
+
+from features import mfcc_engine
+
+SAMPLE_RATE = mfcc_engine.SAMPLE_RATE
+STRETCH_FFT = 1024   # phase-vocoder frame for pitch shifting (~46 ms), hop a quarter of it
+
+
+def _take_rows(x, index):
+    """x[i, index[i]] for every row: one flat take (much faster than take_along_axis)."""
+    offsets = np.arange(len(x), dtype=np.int64) * x.shape[1]
+    return x.reshape(-1).take(index + offsets.reshape((-1,) + (1,) * (index.ndim - 1)))
+
+
+def _interp_rows(x, rates, n_out=None):
+    """Row i of x (B, N) read rates[i] times faster, with linear interpolation: (B, n_out or N)."""
+    n = x.shape[1]
+    # float32 positions are a few thousandths of a sample off at ~1e5, inaudible
+    positions = (np.arange(n_out or n, dtype=np.float32)[None, :]
+                 * rates[:, None].astype(np.float32))
+    base = np.minimum(positions.astype(np.int32), n - 2)
+    frac = positions - base
+    left = _take_rows(x, base)
+    right = _take_rows(x, base + 1)
+    right -= left
+    right *= frac
+    right += left
+    return right
+
+
+def change_speed(x, lengths, rates):
+    """Play each row rates[i] times faster (rate > 1 is shorter and higher).
+
+    Returns (x, lengths); rows stay N samples long, zero past the new length.
+    """
+    n = x.shape[1]
+    out = _interp_rows(x, rates)
+    new_lengths = np.minimum(((lengths - 1) / rates).astype(np.int64) + 1, n)
+    out[np.arange(n)[None, :] >= new_lengths[:, None]] = 0.0
+    return out, new_lengths
+
+
+def stretch(x, factors, n_fft=STRETCH_FFT):
+    """Time-stretch each row by factors[i] (> 1 is longer) at constant pitch.
+
+    Batched phase vocoder: one STFT for the whole batch, magnitudes
+    interpolated at each row's own frame positions, phases advanced by the
+    measured per-bin frequency (a cumulative sum over frames), then one
+    inverse FFT and a 75%-overlap Hann overlap-add. Returns rows of about
+    N * max(factors) samples.
+    """
+    batch, n = x.shape
+    hop = n_fft // 4
+    window = mfcc_engine.hann_window(n_fft)
+
+    padded = np.pad(x, ((0, 0), (n_fft // 2, n_fft // 2 + hop)))
+    frames = np.lib.stride_tricks.sliding_window_view(padded, n_fft, axis=1)[:, ::hop]
+    spectrum = scipy.fft.rfft(frames * window, axis=-1)           # (B, T, bins)
+    n_in = spectrum.shape[1]
+    n_out = int(np.ceil(n_in * factors.max()))
+
+    # Output frame j reads input frame j / factor (fractional)
+    positions = np.minimum(np.arange(n_out)[None, :] / factors[:, None], n_in - 1.001)
+    base = positions.astype(np.int64)
+    frac = (positions - base).astype(np.float32)[:, :, None]
+    rows = np.arange(batch)[:, None]
+    current = spectrum[rows, base]
+    following = spectrum[rows, base + 1]
+
+    magnitude = np.abs(current)
+    magnitude += frac * (np.abs(following) - magnitude)
+
+    # Phase advance per hop: each bin's expected rotation plus the wrapped
+    # deviation. The rotation is added modulo 2*pi so the summed phases stay
+    # small and float32-accurate.
+    expected = (2.0 * np.pi * hop / n_fft) * np.arange(spectrum.shape[2], dtype=np.float32)
+    delta = np.angle(following) - np.angle(current) - expected
+    delta -= 2.0 * np.pi * np.round(delta / (2.0 * np.pi))
+    advance = delta + np.remainder(expected, 2.0 * np.pi)
+    # Output frame j: first frame's phase plus the advances of frames before j
+    phase = np.cumsum(advance, axis=1) - advance + np.angle(current[:, :1])
+
+    stretched = np.empty(magnitude.shape, dtype=np.complex64)
+    stretched.real = magnitude * np.cos(phase)
+    stretched.imag = magnitude * np.sin(phase)
+    out_frames = scipy.fft.irfft(stretched, n=n_fft, axis=-1) * window
+    out = np.zeros((batch, n_out + 3, hop), dtype=np.float32)
+    for k in range(4):   # each frame covers 4 hops
+        out[:, k:k + n_out] += out_frames[:, :, k * hop:(k + 1) * hop]
+    out /= 1.5           # sum of squared Hann windows at 75% overlap
+    return out.reshape(batch, -1)[:, n_fft // 2:]
+
+
+def shift_pitch(x, lengths, semitones):
+    """Shift each row by semitones[i] without changing its duration. Returns (x, lengths)."""
+    n = x.shape[1]
+    factors = 2.0 ** (semitones / 12.0)
+    # Stretching by f then reading f times faster restores the duration
+    out = _interp_rows(stretch(x, factors), factors, n_out=n)
+    out[np.arange(n)[None, :] >= lengths[:, None]] = 0.0
+    return out, lengths
+
+
+def shift_time(x, lengths, shifts):
+    """Move each row right by shifts[i] samples (left if negative), zero filled."""
+    n = x.shape[1]
+    source = np.arange(n)[None, :] - shifts[:, None]
+    valid = (source >= 0) & (source < lengths[:, None])
+    out = _take_rows(x, np.clip(source, 0, n - 1))
+    out[~valid] = 0.0
+    return out, np.clip(lengths + shifts, 1, n)
+
+
+def add_noise(x, lengths, snr_db, rng):
+    """White noise at snr_db[i] below each row's RMS, only over the row's real length."""
+    n = x.shape[1]
+    rms = np.sqrt(np.einsum("ij,ij->i", x, x) / np.maximum(lengths, 1))
+    noise = rng.standard_normal(x.shape, dtype=np.float32)
+    noise *= (rms / 10.0 ** (snr_db / 20.0)).astype(np.float32)[:, None]
+    noise[np.arange(n)[None, :] >= lengths[:, None]] = 0.0
+    return x + noise
+
+
+class Augmenter:
+    """Random speed/pitch/shift/gain/noise for a batch of waveforms.
+
+    Each transform is applied to a row with probability p; only the rows
+    picked for a transform are processed by it.
+    """
+
+    def __init__(self, p=0.5, speed=(0.9, 1.1), semitones=(-2.0, 2.0), max_shift_s=0.25,
+                 gain_db=(-9.0, 6.0), snr_db=(10.0, 40.0), sr=SAMPLE_RATE):
+        self.p = p
+        self.speed = speed
+        self.semitones = semitones
+        self.max_shift = int(max_shift_s * sr)
+        self.gain_db = gain_db
+        self.snr_db = snr_db
+
+    def __call__(self, x, lengths, rng):
+        """Augment x (B, N) float32 with real lengths (B,); returns new (x, lengths)."""
+        x = np.array(x, dtype=np.float32)
+        lengths = np.array(lengths, dtype=np.int64)
+        batch = len(x)
+
+        def pick():
+            return np.flatnonzero(rng.random(batch) < self.p)
+
+        rows = pick()
+        if len(rows):
+            x[rows], lengths[rows] = change_speed(x[rows], lengths[rows],
+                                                  rng.uniform(*self.speed, len(rows)))
+        rows = pick()
+        if len(rows):
+            x[rows], lengths[rows] = shift_pitch(x[rows], lengths[rows],
+                                                 rng.uniform(*self.semitones, len(rows)))
+        rows = pick()
+        if len(rows) and self.max_shift:
+            x[rows], lengths[rows] = shift_time(
+                x[rows], lengths[rows], rng.integers(-self.max_shift, self.max_shift + 1, len(rows)))
+        rows = pick()
+        if len(rows):
+            gain = 10.0 ** (rng.uniform(*self.gain_db, len(rows)) / 20.0)
+            x[rows] = np.clip(x[rows] * gain[:, None].astype(np.float32), -1.0, 1.0)
+        rows = pick()
+        if len(rows):
+            x[rows] = add_noise(x[rows], lengths[rows], rng.uniform(*self.snr_db, len(rows)), rng)
+
+        return x, lengths
+
+    def room(self, samples):
+        """Buffer length that fits a samples-long clip after slowing down and shifting right."""
+        return int(np.ceil(samples / min(self.speed[0], 1.0))) + self.max_shift
+
+
+def waveform_features(x, lengths, max_frames, cut=True):
+    """MFCCs (B, frames, n_mfcc) for a waveform batch, zero past each row's real length.
+
+    Matches the packed features: frames past a clip's end are zero padding.
+    cut=True trims the batch to its longest row (at most max_frames);
+    cut=False pads every batch to max_frames.
+    """
+    frames = np.minimum(1 + np.asarray(lengths) // mfcc_engine.HOP_LENGTH, max_frames)
+    features = mfcc_engine.mfcc_batch(x)[:, :, :max_frames]
+    features = mfcc_engine.pad_or_truncate(features, max_frames).transpose(0, 2, 1)
+    if cut:
+        features = features[:, :int(frames.max())]
+    features[np.arange(features.shape[1])[None, :] >= frames[:, None]] = 0.0
+    return np.ascontiguousarray(features)
+
+
+class AugmentedBatches:
+    """Endless source of augmented (features, labels) training batches.
+
+    waves is the packed (N, samples) int16 waveform memmap, wave_lengths its
+    real per-row lengths. Iterating yields one epoch; each new iteration is
+    the next epoch (tf.data calls the generator once per epoch). batch_plan
+    turns (indices, rng) into a list of index batches, e.g.
+    train_model.bucket_batches; by default indices are shuffled and chunked.
+    variable_length=False pads every batch to max_frames.
+
+    workers threads compute batches ahead of the consumer, at most prefetch
+    at a time. waited_s counts how long the consumer was blocked on them,
+    i.e. how long model.fit waited for data.
+    """
+
+    def __init__(self, waves, wave_lengths, labels, indices, batch_size=32, augmenter=None,
+                 seed=42, workers=None, prefetch=None, max_frames=200, batch_plan=None,
+                 variable_length=True):
+        self.waves = waves
+        self.wave_lengths = np.asarray(wave_lengths)
+        self.labels = np.asarray(labels)
+        self.indices = np.asarray(indices)
+        self.batch_size = batch_size
+        self.augmenter = augmenter or Augmenter()
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.prefetch = prefetch or 2 * self.workers
+        self.max_frames = max_frames
+        self.batch_plan = batch_plan
+        self.variable_length = variable_length
+        self.epoch = 0
+        self.waited_s = 0.0
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def plan(self, epoch):
+        """The index batches of an epoch (deterministic in seed and epoch)."""
+        rng = np.random.default_rng([self.seed, epoch])
+        if self.batch_plan is not None:
+            return self.batch_plan(self.indices, rng)
+        order = rng.permutation(self.indices)
+        return [order[i:i + self.batch_size] for i in range(0, len(order), self.batch_size)]
+
+    def make_batch(self, epoch, number, batch):
+        """Load, augment and featurize one batch; same result for the same (epoch, number)."""
+        rng = np.random.default_rng([self.seed, epoch, number])
+        batch = np.sort(batch)   # sequential memmap reads
+        lengths = self.wave_lengths[batch]
+        # Only read as far as the longest clip in the batch (plus room to slow down)
+        samples = min(self.augmenter.room(int(lengths.max())), self.waves.shape[1])
+        x = np.asarray(self.waves[batch, :samples], dtype=np.float32) * (1.0 / 32767.0)
+        x, lengths = self.augmenter(x, lengths, rng)
+        features = waveform_features(x, lengths, self.max_frames, cut=self.variable_length)
+        return features, self.labels[batch]
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers,
+                                                thread_name_prefix="augment")
+            return self._pool
+
+    def __iter__(self):
+        with self._lock:
+            epoch, self.epoch = self.epoch, self.epoch + 1
+        pool = self._executor()
+        batches = self.plan(epoch)
+        pending = []
+        waited = 0.0
+        yielded = 0
+
+        try:
+            for number, batch in enumerate(batches):
+                pending.append(pool.submit(self.make_batch, epoch, number, batch))
+                if len(pending) < self.prefetch:
+                    continue
+                start = time.perf_counter()
+                result = pending.pop(0).result()
+                waited += time.perf_counter() - start
+                yielded += 1
+                yield result
+
+            while pending:
+                start = time.perf_counter()
+                result = pending.pop(0).result()
+                waited += time.perf_counter() - start
+                yielded += 1
+                yield result
+        finally:
+            # Also runs when tf.data closes the generator early (interrupt, fit stopping)
+            for future in pending:
+                future.cancel()
+            with self._lock:
+                self.waited_s += waited
+            print(f"🎛 Augmented epoch {epoch}: {yielded}/{len(batches)} batches, "
+                  f"input waited {waited:.2f}s")
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
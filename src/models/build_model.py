@@ -1,11 +1,12 @@
 from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense, Dropout
+from tensorflow.keras.layers import (
+    LSTM, GRU, Dense, Dropout, Conv1D, MaxPooling1D, GlobalAveragePooling1D, Input, Masking
+)
 
-def build_emotion_model(input_shape=(200, 40), num_classes=4):
 
-    model = Sequential()
-
-    model.add(LSTM(256, return_sequences=True, input_shape=input_shape))
+def _lstm(model):
+    """The original two-layer LSTM (256 -> 128)."""
+    model.add(LSTM(256, return_sequences=True))
     model.add(Dropout(0.3))
 
     model.add(LSTM(128))
@@ -14,6 +15,72 @@ def build_emotion_model(input_shape=(200, 40), num_classes=4):
     model.add(Dense(64, activation="relu"))
     model.add(Dropout(0.3))
 
+
+def _lstm_lite(model):
+    """One 96-unit LSTM: roughly a tenth of the parameters of "lstm"."""
+    model.add(LSTM(96))
+    model.add(Dropout(0.3))
+
+    model.add(Dense(32, activation="relu"))
+    model.add(Dropout(0.3))
+
+
+def _conv_gru(model):
+    """Conv1D front-end downsamples 200 frames -> 50 before a small GRU."""
+    model.add(Conv1D(64, 5, padding="same", activation="relu"))
+    model.add(MaxPooling1D(2))
+    model.add(Conv1D(64, 3, padding="same", activation="relu"))
+    model.add(MaxPooling1D(2))
+    model.add(Dropout(0.2))
+
+    model.add(GRU(64))
+    model.add(Dropout(0.3))
+
+
+def _tcn(model):
+    """Pure temporal convolutions: dilated causal Conv1D stack, receptive field 31 frames."""
+    for dilation in (1, 2, 4, 8):
+        model.add(Conv1D(64, 3, padding="causal", dilation_rate=dilation, activation="relu"))
+        model.add(Dropout(0.1))
+
+    model.add(GlobalAveragePooling1D())
+    model.add(Dense(64, activation="relu"))
+    model.add(Dropout(0.3))
+
+
+# Architectures train_model can build, by name. "lstm" is the default/production model.
+# Each builder adds the body; build_emotion_model adds the num_classes softmax head.
+VARIANTS = {
+    "lstm": _lstm,
+    "lstm_lite": _lstm_lite,
+    "conv_gru": _conv_gru,
+    "tcn": _tcn,
+}
+
+DEFAULT_VARIANT = "lstm"
+
+# Variants that skip zero-padded frames via a Masking layer. Conv1D can't
+# consume a mask; conv variants rely on length bucketing to keep padding small.
+MASKED_VARIANTS = {"lstm", "lstm_lite"}
+
+
+def build_emotion_model(input_shape=(None, 40), num_classes=4, variant=DEFAULT_VARIANT):
+    """Build and compile a variant.
+
+    The default input_shape=(None, 40) accepts any number of frames;
+    all-zero (padding) frames are masked out for MASKED_VARIANTS.
+    """
+
+    if variant not in VARIANTS:
+        raise ValueError(f"unknown model variant {variant!r}, expected one of {list(VARIANTS)}")
+
+    model = Sequential(name=f"emotion_{variant}")
+    model.add(Input(shape=input_shape))
+    if variant in MASKED_VARIANTS:
+        model.add(Masking(mask_value=0.0))
+
+    VARIANTS[variant](model)
+
     model.add(Dense(num_classes, activation="softmax"))
 
     model.compile(
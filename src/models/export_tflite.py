@@ -0,0 +1,95 @@
+"""
+Export the Keras emotion model to TFLite.
+
+Writes emotion_model.<quant>.tflite next to the .h5 for each requested
+quantization:
+  float32  plain conversion
+  float16  float16 weights (about half the size, float compute)
+  dynamic  int8 weights, float activations (no calibration data needed)
+  int8     full post-training int8, calibrated on samples from data/processed
+
+Run from src/:
+    python -m models.export_tflite [--model models/emotion_model.h5] [--quant float16 int8]
+
+Serve an export with MOOD_BACKEND=tflite MOOD_TFLITE_QUANT=int8, and compare
+backends with python -m benchmarks.backend_compare.
+"""
+
+import os
+import argparse
+import numpy as np
+
+from models.predict import INPUT_SHAPE, tflite_path
+
+QUANTIZATIONS = ["float32", "float16", "dynamic", "int8"]
+
+DEFAULT_MODEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "emotion_model.h5")
+
+
+def representative_samples(n=200, seed=0):
+    """Up to n (200, 40) feature arrays from the training data, for int8 calibration."""
+    from models import train_model
+
+    rng = np.random.default_rng(seed)
+    if train_model.is_pack_current():
+        X, _ = train_model.open_packed()
+        for i in np.sort(rng.choice(len(X), size=min(n, len(X)), replace=False)):
+            yield np.asarray(X[i], dtype=np.float32)
+        return
+
+    files = train_model.list_dataset_files()
+    picked = rng.choice(len(files), size=min(n, len(files)), replace=False)
+    for i in picked:
+        mfcc, _ = train_model.load_features(files[i][0], train_model.FeatureCache())
+        if mfcc is not None:
+            yield mfcc.T.astype(np.float32)
+
+
+def convert(model_path=DEFAULT_MODEL, quant="int8", n_calibration=200):
+    """Convert model_path with the given quantization; returns the .tflite path."""
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(model_path)
+
+    # A fixed batch of 1 lets the converter fuse the LSTMs into TFLite's
+    # native UnidirectionalSequenceLSTM op instead of a generic while loop.
+    run = tf.function(lambda x: model(x, training=False))
+    concrete = run.get_concrete_function(tf.TensorSpec((1,) + INPUT_SHAPE, tf.float32))
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([concrete], model)
+
+    if quant == "float16":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif quant == "dynamic":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    elif quant == "int8":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: (
+            [x[None]] for x in representative_samples(n_calibration)
+        )
+        # int8 kernels where available, float fallback for the rest; I/O stays float32
+        converter.target_spec.supported_ops = [
+            tf.lite.OpsSet.TFLITE_BUILTINS_INT8,
+            tf.lite.OpsSet.TFLITE_BUILTINS,
+        ]
+    elif quant != "float32":
+        raise ValueError(f"unknown quantization {quant!r}, expected one of {QUANTIZATIONS}")
+
+    out_path = tflite_path(model_path, quant)
+    with open(out_path, "wb") as f:
+        f.write(converter.convert())
+
+    size_kb = os.path.getsize(out_path) / 1024
+    print(f"✔ {quant:8s} → {out_path} ({size_kb:.0f} KB)")
+    return out_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the emotion model to TFLite")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--quant", nargs="+", default=QUANTIZATIONS, choices=QUANTIZATIONS)
+    parser.add_argument("--calibration-samples", type=int, default=200)
+    args = parser.parse_args()
+
+    for quant in args.quant:
+        convert(args.model, quant, args.calibration_samples)
@@ -1,34 +1,325 @@
+import os
+import sys
+import glob
+import threading
 import numpy as np
-from tensorflow.keras.models import load_model
 from features.mfcc_extractor import extract_mfcc
 
 EMOTIONS = ["angry", "happy", "neutral", "sad"]
 
+INPUT_SHAPE = (200, 40)
+
+# Long recordings are scored as overlapping INPUT_SHAPE[0]-frame windows
+# (50% overlap), all in one batch, and the window probabilities averaged.
+WINDOW_HOP = 100
+
+# Inference backend: "keras" (the .h5) or "tflite" (an exported
+# emotion_model.<quant>.tflite next to it, see models/export_tflite.py).
+BACKEND = os.environ.get("MOOD_BACKEND", "keras")
+TFLITE_QUANT = os.environ.get("MOOD_TFLITE_QUANT", "int8")
+
+
+def tflite_path(model_path, quant=TFLITE_QUANT):
+    """emotion_model.h5 -> emotion_model.<quant>.tflite"""
+    return os.path.splitext(model_path)[0] + f".{quant}.tflite"
+
+
+class TFLiteModel:
+    """TFLite interpreter with the small part of the Keras model API we use.
+
+    The exported graph has a fixed batch of 1, so batches are run row by row
+    (cheap for the interpreter). Uses tflite_runtime when installed, so a
+    serving box doesn't need full TensorFlow.
+    """
+
+    def __init__(self, model_path, num_threads=None):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            from tensorflow.lite import Interpreter
+
+        self.interpreter = Interpreter(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._lock = threading.Lock()  # an interpreter is not thread-safe
+
+    def _run_one(self, x):
+        scale, zero_point = self._input["quantization"]
+        if self._input["dtype"] != np.float32:
+            x = np.round(x / scale + zero_point).astype(self._input["dtype"])
+        self.interpreter.set_tensor(self._input["index"], x[None])
+        self.interpreter.invoke()
+        y = self.interpreter.get_tensor(self._output["index"])[0]
+
+        scale, zero_point = self._output["quantization"]
+        if self._output["dtype"] != np.float32:
+            y = (y.astype(np.float32) - zero_point) * scale
+        return y
+
+    def __call__(self, x, training=False):
+        x = np.asarray(x, dtype=np.float32)
+        with self._lock:
+            return np.stack([self._run_one(row) for row in x])
+
+    def predict(self, x, batch_size=None, verbose=0):
+        return self(x)
+
+
+class EmotionClassifier:
+    """Keeps one model in memory and reuses it for every prediction.
+
+    The model is loaded (and warmed up with a dummy batch) on first use.
+    If the model file changes on disk it is reloaded on the next call.
+    backend is "keras" or "tflite"; by default it follows the file extension.
+    """
+
+    def __init__(self, model_path="emotion_model.h5", hot_reload=True, backend=None):
+        self.model_path = os.path.abspath(model_path)
+        self.backend = backend or ("tflite" if model_path.endswith(".tflite") else "keras")
+        self.hot_reload = hot_reload
+        self._model = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _file_mtime(self):
+        try:
+            return os.path.getmtime(self.model_path)
+        except OSError:
+            return None
+
+    def _ensure_loaded(self):
+        if self._model is not None:
+            if not self.hot_reload or self._file_mtime() == self._mtime:
+                return self._model
+
+        with self._lock:
+            mtime = self._file_mtime()
+            if self._model is not None and (not self.hot_reload or mtime == self._mtime):
+                return self._model
+
+            try:
+                model = self._load_model()
+                # Warm-up: the first call builds the graph, do it now instead
+                # of on the user's first utterance.
+                model(np.zeros((1,) + INPUT_SHAPE, dtype=np.float32), training=False)
+            except Exception as e:
+                if self._model is None:
+                    raise
+                # Half-written file during a re-save: keep serving the old model.
+                print("⚠️ Reload failed, keeping previous model:", e)
+                self._mtime = mtime
+                return self._model
+
+            if self._model is not None:
+                print("🔄 Reloaded model:", self.model_path)
+            self._model = model
+            self._mtime = mtime
+            return model
+
+    def _load_model(self):
+        if self.backend == "tflite":
+            return TFLiteModel(self.model_path)
+
+        # TensorFlow is imported here, not at module import, so apps
+        # can start (and render) before paying for it.
+        from tensorflow.keras.models import load_model
+        return load_model(self.model_path)
+
+    def load(self):
+        """Load the model now (e.g. at app start). Returns self."""
+        self._ensure_loaded()
+        return self
+
+    def loaded_model(self):
+        """The underlying model, loaded (or hot-reloaded) if needed."""
+        return self._ensure_loaded()
+
+    @property
+    def is_loaded(self):
+        """True once a model has been loaded (and not failed to load)."""
+        return self._model is not None
+
+    def _fixed_frames(self, model):
+        """Frame count the loaded model requires, or None if it takes any length."""
+        if isinstance(model, TFLiteModel):
+            return int(model._input["shape"][1])
+        return model.input_shape[1]
+
+    def windows(self, x, fixed_frames=None):
+        """Cut (frames, 40) features into the batch the model sees.
+
+        Up to one window long: the clip itself, as (1, frames, 40), padded
+        to fixed_frames only if the model needs it. Longer: overlapping
+        full windows, the last one aligned to the end.
+        """
+        window = INPUT_SHAPE[0]
+        frames = len(x)
+        if frames <= window:
+            target = fixed_frames or frames
+            if frames < target:
+                x = np.pad(x, ((0, target - frames), (0, 0)))
+            return x[None, :target]
+
+        starts = list(range(0, frames - window, WINDOW_HOP)) + [frames - window]
+        return np.stack([x[s:s + window] for s in starts])
+
+    @staticmethod
+    def _masks_padding(model):
+        """True if zero-padded frames don't change the model's output (a Masking layer)."""
+        return any(type(layer).__name__ == "Masking" for layer in getattr(model, "layers", ()))
+
+    def window_probs(self, model, xs, batch_size=32):
+        """Mean window probabilities for each (frames, 40) array in xs, same as predict().
+
+        Windows of every clip share model calls of up to batch_size windows.
+        Clips of different lengths are zero-padded together only when the
+        model masks padding; otherwise each length gets its own calls, so a
+        clip's result never depends on what it was batched with.
+        """
+        fixed = self._fixed_frames(model)
+        windows = [self.windows(x, fixed) for x in xs]
+        if fixed or self._masks_padding(model):
+            groups = {None: list(range(len(windows)))}
+        else:
+            groups = {}
+            for i, w in enumerate(windows):
+                groups.setdefault(w.shape[1], []).append(i)
+
+        results = [None] * len(windows)
+        for members in groups.values():
+            frames = max(windows[i].shape[1] for i in members)
+            stacked = np.concatenate([
+                np.pad(windows[i], ((0, 0), (0, frames - windows[i].shape[1]), (0, 0)))
+                for i in members
+            ])
+            probs = np.concatenate([
+                np.asarray(model(stacked[start:start + batch_size], training=False))
+                for start in range(0, len(stacked), batch_size)
+            ])
+            start = 0
+            for i in members:
+                results[i] = probs[start:start + len(windows[i])].mean(axis=0)
+                start += len(windows[i])
+        return results
+
+    def predict(self, mfcc):
+        """Predict from an MFCC array of shape (40, frames), e.g. from extract_mfcc.
+
+        Any length works: short clips aren't padded when the model accepts
+        variable lengths, and long ones are scored as overlapping windows in
+        a single batched call, with the window probabilities averaged.
+        """
+        x = np.transpose(mfcc, (1, 0)).astype(np.float32)   # (40,frames) -> (frames,40)
+
+        try:
+            model = self._ensure_loaded()
+        except Exception as e:
+            print("⚠️ Could not load model, using random output:", e)
+            probs = np.random.rand(len(EMOTIONS))
+            probs = probs / np.sum(probs)
+            return EMOTIONS[np.argmax(probs)], probs
+
+        probs = self.window_probs(model, [x])[0]
+        return EMOTIONS[int(np.argmax(probs))], probs
+
+    def predict_batch(self, mfccs, batch_size=32):
+        """Predict a list of MFCC arrays, each (40, frames) of any length.
+
+        Every clip is scored like predict() (windows averaged), with the
+        windows of all clips batched together. Returns an (N, num_classes)
+        probability array.
+        """
+        xs = [np.transpose(m, (1, 0)).astype(np.float32) for m in mfccs]  # -> (frames,40)
+
+        try:
+            model = self._ensure_loaded()
+        except Exception as e:
+            print("⚠️ Could not load model, using random output:", e)
+            probs = np.random.rand(len(xs), len(EMOTIONS))
+            return probs / probs.sum(axis=1, keepdims=True)
+
+        if not xs:
+            return np.zeros((0, len(EMOTIONS)), dtype=np.float32)
+        return np.stack(self.window_probs(model, xs, batch_size))
+
+    def predict_file(self, file_path):
+        """Predict from a file path, encoded audio bytes, a file-like object or an ndarray."""
+        mfcc = extract_mfcc(file_path, max_pad_len=None)
+        if mfcc is None:
+            return None, None
+        return self.predict(mfcc)
+
+
+_classifiers = {}
+_classifiers_lock = threading.Lock()
+
+
+def get_classifier(model_path="emotion_model.h5", backend=None):
+    """Return the process-wide classifier for model_path (one per file).
+
+    With backend="tflite" (or MOOD_BACKEND=tflite) a .h5 path is swapped for
+    its exported emotion_model.<MOOD_TFLITE_QUANT>.tflite sibling.
+    """
+    backend = backend or BACKEND
+    if backend == "tflite" and not model_path.endswith(".tflite"):
+        model_path = tflite_path(model_path)
+
+    key = os.path.abspath(model_path)
+    with _classifiers_lock:
+        clf = _classifiers.get(key)
+        if clf is None:
+            clf = EmotionClassifier(key, backend=backend)
+            _classifiers[key] = clf
+        return clf
+
+
 def predict_emotion(file_path, model_path="emotion_model.h5"):
-    # 1. Extract MFCC
-    mfcc = extract_mfcc(file_path)
+    return get_classifier(model_path).predict_file(file_path)
+
+
+def predict_emotions(paths, model_path="emotion_model.h5", batch_size=32, chunk_size=256):
+    """Score many files, yielding (path, emotion, probs) in input order.
+
+    Files are processed chunk_size at a time: the windows of one chunk's
+    full-length MFCCs are predicted together (see predict_batch), so results
+    match predict_file and memory stays bounded however many paths are passed in (paths
+    may be any iterable, e.g. a generator over a huge directory). Files whose
+    features cannot be extracted yield (path, None, None).
+    """
+    clf = get_classifier(model_path)
+    chunk = []
+
+    def flush(chunk):
+        mfccs = [extract_mfcc(p, max_pad_len=None) for p in chunk]
+        ok = [i for i, m in enumerate(mfccs) if m is not None]
+        probs = clf.predict_batch([mfccs[i] for i in ok], batch_size=batch_size) if ok else []
+        by_index = dict(zip(ok, probs))
 
-    if mfcc is None:
-        return None, None
+        for i, path in enumerate(chunk):
+            if i in by_index:
+                p = by_index[i]
+                yield path, EMOTIONS[int(np.argmax(p))], p
+            else:
+                yield path, None, None
 
-    # Convert MFCC (40,200) -> (200,40)
-    mfcc = np.transpose(mfcc, (1, 0))
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) >= chunk_size:
+            yield from flush(chunk)
+            chunk = []
 
-    # Add batch dimension -> (1, 200, 40)
-    mfcc = np.expand_dims(mfcc, axis=0)
+    if chunk:
+        yield from flush(chunk)
 
-    # 2. Load model
-    try:
-        model = load_model(model_path)
-    except Exception as e:
-        print("⚠️ Could not load model, using random output:", e)
-        probs = np.random.rand(4)
-        probs = probs / np.sum(probs)
-        return EMOTIONS[np.argmax(probs)], probs
 
-    # 3. Predict
-    probs = model.predict(mfcc)[0]
-    predicted_index = np.argmax(probs)
-    emotion = EMOTIONS[predicted_index]
+if __name__ == "__main__":
+    # Offline re-scoring: python -m models.predict [folder] [model_path]
+    folder = sys.argv[1] if len(sys.argv) > 1 else "../data/audio_samples"
+    model_path = sys.argv[2] if len(sys.argv) > 2 else "models/emotion_model.h5"
 
-    return emotion, probs
+    # Flat legacy WAVs and the sharded spool layout (<day>/<shard>/*.flac)
+    files = (path for pattern in ("**/*.wav", "**/*.flac")
+             for path in glob.iglob(os.path.join(folder, pattern), recursive=True))
+    for path, emotion, probs in predict_emotions(files, model_path=model_path):
+        print(os.path.basename(path), "→", emotion if emotion else "failed")
@@ -1,9 +1,27 @@
 import os
-import librosa
+import sys
+import json
+import time
+import hashlib
+import argparse
 import numpy as np
 from sklearn.model_selection import train_test_split
 from tensorflow.keras.callbacks import ModelCheckpoint
-from build_model import build_emotion_model
+
+# Make src/ importable when this script is run from src/models
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+PROCESSED_DIR = os.path.join(PROJECT_ROOT, "data", "processed")
+
+from models.build_model import build_emotion_model, VARIANTS, DEFAULT_VARIANT
+from utils.sort_ravdess import read_manifest
+from features.feature_cache import FeatureCache
+from features import mfcc_engine
+from features.mfcc_extractor import trim_silence, VAD
+from features.audio_io import load_audio
 
 # Emotion mapping for your dataset's folder order
 EMOTION_MAP = {
@@ -13,23 +31,48 @@ EMOTION_MAP = {
     "sad": 3
 }
 
-def extract_mfcc(file_path, max_pad_len=200):
-    """Extract MFCC from an audio file and pad/truncate to 40x200."""
-    audio, sr = librosa.load(file_path, sr=22050)
-    mfcc = librosa.feature.mfcc(y=audio, sr=sr, n_mfcc=40)
+SAMPLE_RATE = mfcc_engine.SAMPLE_RATE
+N_MFCC = mfcc_engine.N_MFCC
+MAX_PAD_LEN = 200
 
-    # Pad or truncate
-    if mfcc.shape[1] < max_pad_len:
-        pad_width = max_pad_len - mfcc.shape[1]
-        mfcc = np.pad(mfcc, ((0, 0), (0, pad_width)), mode='constant')
-    else:
-        mfcc = mfcc[:, :max_pad_len]
+# Everything that affects the features goes into the cache key.
+FEATURE_PARAMS = {
+    "sr": SAMPLE_RATE,
+    "n_mfcc": N_MFCC,
+    "max_pad_len": MAX_PAD_LEN,
+    "engine": mfcc_engine.ENGINE_VERSION,
+}
+if VAD:
+    # Train on trimmed clips when inference trims (MOOD_VAD=1); only added
+    # when on, so existing caches and packs stay valid otherwise.
+    FEATURE_PARAMS["vad"] = 1
 
-    return mfcc
+def extract_mfcc(file_path, max_pad_len=MAX_PAD_LEN):
+    """Extract MFCC from an audio file and pad/truncate to 40x200.
 
-def load_dataset(folder="../../data/processed"):
+    Same engine (and VAD setting) as inference (features.mfcc_extractor), so
+    train and serve features are identical.
+    """
+    if VAD:
+        audio, sr = load_audio(file_path, sr=SAMPLE_RATE)
+        audio, _ = trim_silence(audio, sr)
+        return mfcc_engine.pad_or_truncate(mfcc_engine.mfcc(audio, sr=sr, n_mfcc=N_MFCC),
+                                           max_pad_len)
+    return mfcc_engine.compute_mfcc(file_path, sr=SAMPLE_RATE, n_mfcc=N_MFCC,
+                                    max_pad_len=max_pad_len)
 
-    X, y = [], []
+def list_dataset_files(folder=PROCESSED_DIR):
+    """Return [(file_path, label)] for every wav under folder/<emotion>/.
+
+    If folder has a manifest from utils/sort_ravdess.py it is used as the
+    file list (sorted by path) instead of listing the directories.
+    """
+    manifest = read_manifest(folder)
+    if manifest:
+        return [(os.path.join(folder, rel), EMOTION_MAP[entry["label"]])
+                for rel, entry in sorted(manifest.items()) if entry["label"] in EMOTION_MAP]
+
+    files = []
 
     for emotion in os.listdir(folder):
         emotion_folder = os.path.join(folder, emotion)
@@ -45,10 +88,123 @@ def load_dataset(folder="../../data/processed"):
 
         for file in os.listdir(emotion_folder):
             if file.endswith(".wav"):
-                file_path = os.path.join(emotion_folder, file)
-                mfcc = extract_mfcc(file_path)
-                X.append(mfcc)
-                y.append(label)
+                files.append((os.path.join(emotion_folder, file), label))
+
+    return files
+
+
+def dataset_digest(files, folder=PROCESSED_DIR):
+    """sha1 over the file list and each file's content identity.
+
+    Uses the sha1s recorded by utils/sort_ravdess.py when folder has its
+    manifest, else each file's size and mtime.
+    """
+    manifest = read_manifest(folder)
+    digest = hashlib.sha1()
+    for path, label in files:
+        rel = os.path.relpath(path, folder).replace(os.sep, "/")
+        entry = manifest.get(rel)
+        if entry is not None:
+            identity = entry["sha1"]
+        else:
+            try:
+                st = os.stat(path)
+                identity = f"{st.st_size}:{st.st_mtime_ns}"
+            except OSError:
+                identity = "missing"
+        digest.update(f"{rel}\0{label}\0{identity}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_features(file_path, cache=None):
+    """Return (mfcc, cache_hit) for one file, or (None, error message) on failure."""
+    try:
+        if cache:
+            key = cache.key(file_path, FEATURE_PARAMS)
+            mfcc = cache.get(key)
+            if mfcc is not None:
+                return mfcc, True
+            mfcc = extract_mfcc(file_path)
+            cache.put(key, mfcc)
+            return mfcc, False
+        return extract_mfcc(file_path), False
+    except Exception as e:
+        return None, str(e)
+
+
+# Per-process cache handle for pool workers (set by _init_worker)
+_worker_cache = None
+
+def _init_worker(cache):
+    global _worker_cache
+    _worker_cache = cache
+
+def _load_features_worker(file_path):
+    return load_features(file_path, _worker_cache)
+
+
+def iter_features(files, cache=True, workers=1, chunksize=16, progress_every=200):
+    """Yield (file_path, label, mfcc) for each loadable file in files, in order.
+
+    cache=True uses the default on-disk FeatureCache; pass a FeatureCache to
+    use a custom one, or False to always recompute.
+
+    workers > 1 extracts in a process pool (None = all cores). Results keep
+    the input order, so the output is identical either way. Files that fail
+    to load are reported and skipped.
+    """
+    if cache is True:
+        cache = FeatureCache()
+
+    paths = [path for path, _ in files]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(cache,))
+        results = executor.map(_load_features_worker, paths, chunksize=chunksize)
+        print(f"⚙️ Extracting features with {workers} workers...")
+    else:
+        executor = None
+        results = (load_features(path, cache) for path in paths)
+
+    loaded = hits = failed = 0
+    start = time.perf_counter()
+
+    try:
+        for i, ((path, label), (mfcc, info)) in enumerate(zip(files, results), start=1):
+            if mfcc is None:
+                failed += 1
+                print(f"❌ Skipping {path}: {info}")
+            else:
+                loaded += 1
+                hits += info is True
+                yield path, label, mfcc
+
+            if progress_every and i % progress_every == 0:
+                rate = i / (time.perf_counter() - start)
+                print(f"   {i}/{len(files)} files ({rate:.1f} files/s)")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    elapsed = time.perf_counter() - start
+    print(f"✔ Loaded {loaded} files in {elapsed:.1f}s "
+          f"({len(files) / max(elapsed, 1e-9):.1f} files/s), {failed} failed")
+    if cache:
+        print(f"🗂 Feature cache: {hits}/{loaded} hits")
+
+
+def load_dataset(folder=PROCESSED_DIR, cache=True, workers=1, chunksize=16):
+    """Load every wav under folder/<emotion>/ into in-memory X (N, 200, 40) and y (N,) arrays."""
+    X, y = [], []
+
+    for _, label, mfcc in iter_features(list_dataset_files(folder), cache, workers, chunksize):
+        X.append(mfcc)
+        y.append(label)
 
     X = np.array(X)               # shape (samples, 40, 200)
     X = np.transpose(X, (0, 2, 1))  # shape (samples, 200, 40)
@@ -57,37 +213,396 @@ def load_dataset(folder="../../data/processed"):
     return X, y
 
 
-def train():
-    print("📥 Loading dataset...")
-    X, y = load_dataset()
+# -------------------------------------------------------
+# Packed dataset: one memory-mapped (N, 200, 40) float32 file
+# + labels sidecar + manifest, written row by row so the
+# full dataset never has to sit in RAM.
+# -------------------------------------------------------
+PACKED_DIR = os.path.join(PROJECT_ROOT, "data", "packed")
+FEATURES_FILE = "features.npy"
+LABELS_FILE = "labels.npy"
+LENGTHS_FILE = "lengths.npy"
+MANIFEST_FILE = "manifest.json"
+
+
+def pack_dataset(folder=PROCESSED_DIR, out_dir=PACKED_DIR, cache=True, workers=1,
+                 chunksize=16):
+    """Extract features for folder and write them to out_dir as a packed dataset."""
+    files = list_dataset_files(folder)
+    os.makedirs(out_dir, exist_ok=True)
+
+    features = np.lib.format.open_memmap(
+        os.path.join(out_dir, FEATURES_FILE), mode="w+", dtype=np.float32,
+        shape=(len(files), MAX_PAD_LEN, N_MFCC)
+    )
+    labels = np.zeros(len(files), dtype=np.int64)
+    lengths = np.zeros(len(files), dtype=np.int32)
+    packed_files = []
+
+    for path, label, mfcc in iter_features(files, cache, workers, chunksize):
+        row = len(packed_files)
+        features[row] = mfcc.T   # (40,200) -> (200,40)
+        labels[row] = label
+        lengths[row] = frame_lengths(features[row:row + 1])[0]
+        packed_files.append(path)
+
+    features.flush()
+    del features
+
+    count = len(packed_files)
+    np.save(os.path.join(out_dir, LABELS_FILE), labels[:count])
+    np.save(os.path.join(out_dir, LENGTHS_FILE), lengths[:count])
+
+    manifest = {
+        "count": count,
+        "shape": [MAX_PAD_LEN, N_MFCC],
+        "dtype": "float32",
+        "feature_params": FEATURE_PARAMS,
+        "source_folder": os.path.abspath(folder),
+        "source_count": len(files),
+        "source_digest": dataset_digest(files, folder),
+        "files": packed_files,
+    }
+    with open(os.path.join(out_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    print(f"📦 Packed {count} samples into {out_dir}")
+    return manifest
+
+
+def is_pack_current(folder=PROCESSED_DIR, out_dir=PACKED_DIR):
+    """True if out_dir holds a pack made from folder's current files and feature params.
+
+    Files are compared by dataset_digest, so replaced or renamed wavs make
+    the pack stale even when the count is unchanged.
+    """
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    return (manifest.get("feature_params") == FEATURE_PARAMS
+            and manifest.get("source_digest") == dataset_digest(list_dataset_files(folder), folder))
+
+
+def open_packed(out_dir=PACKED_DIR):
+    """Return (X, y) where X is a read-only memmap of shape (N, 200, 40)."""
+    with open(os.path.join(out_dir, MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    X = np.load(os.path.join(out_dir, FEATURES_FILE), mmap_mode="r")[:manifest["count"]]
+    y = np.load(os.path.join(out_dir, LABELS_FILE))
+    return X, y
+
+
+def frame_lengths(X, chunk=1024):
+    """Real (unpadded) frame count of each (frames, n_mfcc) row: up to its last non-zero frame."""
+    lengths = np.empty(len(X), dtype=np.int32)
+    for start in range(0, len(X), chunk):
+        voiced = np.any(np.asarray(X[start:start + chunk]) != 0, axis=2)   # (n, frames)
+        last = voiced.shape[1] - np.argmax(voiced[:, ::-1], axis=1)
+        lengths[start:start + chunk] = np.where(voiced.any(axis=1), last, 1)
+    return lengths
 
+
+def open_lengths(out_dir=PACKED_DIR):
+    """Per-row frame counts of the packed dataset (computed once for older packs)."""
+    path = os.path.join(out_dir, LENGTHS_FILE)
+    if os.path.exists(path):
+        return np.load(path)
+    X, _ = open_packed(out_dir)
+    lengths = frame_lengths(X)
+    np.save(path, lengths)
+    return lengths
+
+
+# -------------------------------------------------------
+# Packed waveforms for on-the-fly augmentation (models/augment.py):
+# int16 (N, WAVE_SAMPLES) memmap whose rows line up with the
+# feature pack, so the same train/test indices apply.
+# -------------------------------------------------------
+WAVES_FILE = "waves.npy"
+WAVE_LENGTHS_FILE = "wave_lengths.npy"
+WAVES_MANIFEST_FILE = "waves.json"
+# Samples behind the first MAX_PAD_LEN (centered) MFCC frames; features never see further
+WAVE_SAMPLES = (MAX_PAD_LEN - 1) * mfcc_engine.HOP_LENGTH + mfcc_engine.N_FFT // 2
+
+
+def load_waveform(file_path):
+    """Decoded mono audio at SAMPLE_RATE, trimmed like extract_mfcc when VAD is on."""
+    audio, sr = load_audio(file_path, sr=SAMPLE_RATE)
+    if VAD:
+        audio, _ = trim_silence(audio, sr)
+    return audio
+
+
+def _load_waveform_row(file_path):
+    try:
+        return load_waveform(file_path), None
+    except Exception as e:
+        return None, str(e)
+
+
+def pack_waveforms(out_dir=PACKED_DIR, workers=1):
+    """Decode the feature pack's files into out_dir/waves.npy (int16, rows aligned with it).
+
+    Rows that fail to decode stay empty with length 0 (see open_waveforms);
+    returns their row numbers.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    with open(os.path.join(out_dir, MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+    files, source_digest = manifest["files"], manifest.get("source_digest")
+
+    waves = np.lib.format.open_memmap(
+        os.path.join(out_dir, WAVES_FILE), mode="w+", dtype=np.int16,
+        shape=(len(files), WAVE_SAMPLES)
+    )
+    lengths = np.zeros(len(files), dtype=np.int32)
+    failed = []
+    start = time.perf_counter()
+
+    # Decoding and resampling release the GIL, so threads are enough here
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        for row, (path, (audio, error)) in enumerate(
+                zip(files, pool.map(_load_waveform_row, files))):
+            if audio is None:
+                print(f"❌ Could not decode {path}: {error}")
+                failed.append(row)
+                continue
+            audio = audio[:WAVE_SAMPLES]
+            waves[row, :len(audio)] = np.clip(np.round(audio * 32767.0), -32768, 32767)
+            lengths[row] = len(audio)
+
+    waves.flush()
+    del waves
+    np.save(os.path.join(out_dir, WAVE_LENGTHS_FILE), lengths)
+    with open(os.path.join(out_dir, WAVES_MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump({"files": files, "source_digest": source_digest, "samples": WAVE_SAMPLES,
+                   "feature_params": FEATURE_PARAMS}, f)
+
+    print(f"🌊 Packed {len(files) - len(failed)} waveforms into {out_dir} "
+          f"in {time.perf_counter() - start:.1f}s, {len(failed)} failed")
+    return failed
+
+
+def is_waves_current(out_dir=PACKED_DIR):
+    """True if the waveform pack matches the feature pack's rows and feature params."""
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE), encoding="utf-8") as f:
+            manifest = json.load(f)
+        with open(os.path.join(out_dir, WAVES_MANIFEST_FILE), encoding="utf-8") as f:
+            waves = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    return (waves.get("files") == manifest.get("files")
+            and waves.get("source_digest") == manifest.get("source_digest")
+            and waves.get("samples") == WAVE_SAMPLES
+            and waves.get("feature_params") == FEATURE_PARAMS)
+
+
+def open_waveforms(out_dir=PACKED_DIR):
+    """Return (waves, lengths): read-only int16 memmap (N, WAVE_SAMPLES) and real lengths.
+
+    A length of 0 marks a row that could not be decoded.
+    """
+    waves = np.load(os.path.join(out_dir, WAVES_FILE), mmap_mode="r")
+    return waves, np.load(os.path.join(out_dir, WAVE_LENGTHS_FILE))
+
+
+def bucket_batches(indices, lengths, batch_size=32, rng=None, pool_batches=50):
+    """Split indices into batches of similar length.
+
+    With an rng, indices are shuffled, then sorted by length inside pools of
+    pool_batches batches, and the batch order is shuffled again: batches are
+    length-homogeneous but still differ from epoch to epoch. Without one,
+    everything is sorted by length (least padding, for evaluation).
+    """
+    indices = np.asarray(indices)
+    if rng is None:
+        order, pool = indices, len(indices) or 1
+    else:
+        order, pool = rng.permutation(indices), batch_size * pool_batches
+
+    batches = []
+    for start in range(0, len(order), pool):
+        chunk = order[start:start + pool]
+        chunk = chunk[np.argsort(lengths[chunk], kind="stable")]
+        batches.extend(chunk[i:i + batch_size] for i in range(0, len(chunk), batch_size))
+
+    if rng is not None:
+        batches = [batches[i] for i in rng.permutation(len(batches))]
+    return batches
+
+
+def make_tf_dataset(X, y, indices, batch_size=32, shuffle=False, seed=42, lengths=None):
+    """Stream batches of X[indices] from the memmap through tf.data with prefetching.
+
+    Only the index array is shuffled (reshuffled every epoch); rows are read
+    from disk one batch at a time.
+
+    With lengths (see open_lengths), batches are bucketed by length and cut
+    to their longest row, so a batch of short clips costs short sequences;
+    the remaining zero padding is masked by the model.
+    """
+    import tensorflow as tf
+
+    indices = np.asarray(indices)
+    rng = np.random.default_rng(seed)
+    frames, n_features = X.shape[1:]
+
+    def batches():
+        if lengths is not None:
+            for batch in bucket_batches(indices, lengths, batch_size, rng if shuffle else None):
+                batch = np.sort(batch)
+                max_len = int(lengths[batch].max())
+                yield np.asarray(X[batch, :max_len], dtype=np.float32), y[batch]
+            return
+
+        order = rng.permutation(indices) if shuffle else indices
+        for start in range(0, len(order), batch_size):
+            # Sorted reads are sequential on disk; order inside a batch doesn't matter.
+            batch = np.sort(order[start:start + batch_size])
+            yield np.asarray(X[batch], dtype=np.float32), y[batch]
+
+    dataset = tf.data.Dataset.from_generator(
+        batches,
+        output_signature=(
+            tf.TensorSpec(shape=(None, None if lengths is not None else frames, n_features),
+                          dtype=tf.float32),
+            tf.TensorSpec(shape=(None,), dtype=tf.int64),
+        ),
+    )
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+def make_augmented_dataset(waves, wave_lengths, y, indices, batch_size=32, seed=42,
+                           workers=None, lengths=None):
+    """tf.data pipeline of freshly augmented batches (see models/augment.py).
+
+    Returns (dataset, stream); stream.waited_s tells how long training
+    waited on augmentation. With lengths, batches are length-bucketed like
+    make_tf_dataset; otherwise every batch is MAX_PAD_LEN frames.
+    """
+    import tensorflow as tf
+    from models.augment import AugmentedBatches
+
+    plan = None
+    if lengths is not None:
+        plan = lambda idx, rng: bucket_batches(idx, lengths, batch_size, rng)
+
+    stream = AugmentedBatches(waves, wave_lengths, y, indices, batch_size=batch_size,
+                              seed=seed, workers=workers, max_frames=MAX_PAD_LEN,
+                              batch_plan=plan, variable_length=lengths is not None)
+    dataset = tf.data.Dataset.from_generator(
+        stream.__iter__,
+        output_signature=(
+            tf.TensorSpec(shape=(None, None if lengths is not None else MAX_PAD_LEN, N_MFCC),
+                          dtype=tf.float32),
+            tf.TensorSpec(shape=(None,), dtype=tf.int64),
+        ),
+    )
+    return dataset.prefetch(tf.data.AUTOTUNE), stream
+
+
+def model_filename(variant=DEFAULT_VARIANT):
+    """Checkpoint name for a variant; the default keeps the historical emotion_model.h5."""
+    if variant == DEFAULT_VARIANT:
+        return "emotion_model.h5"
+    return f"emotion_model_{variant}.h5"
+
+
+def train(workers=1, repack=False, batch_size=32, epochs=40, variant=DEFAULT_VARIANT,
+          model_path=None, bucket=True, augment=False, augment_workers=None):
+    """Train one model variant; returns (checkpoint path, best val_accuracy).
+
+    bucket=True feeds length-bucketed, variable-length batches (see make_tf_dataset).
+    augment=True trains on waveforms augmented on the fly by augment_workers
+    threads (see make_augmented_dataset); validation stays un-augmented.
+    """
+    model_path = model_path or model_filename(variant)
+
+    if repack or not is_pack_current():
+        print("📥 Packing dataset...")
+        pack_dataset(workers=workers)
+
+    X, y = open_packed()
     print("Dataset loaded:", X.shape, y.shape)
 
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
+    train_idx, test_idx = train_test_split(
+        np.arange(len(y)), test_size=0.2, random_state=42
     )
+    lengths = open_lengths() if bucket else None
+    if bucket:
+        print(f"📏 Mean clip length {lengths.mean():.0f} of {MAX_PAD_LEN} frames")
+    stream = None
+    if augment:
+        if repack or not is_waves_current():
+            print("📥 Packing waveforms for augmentation...")
+            pack_waveforms(workers=workers)
+        waves, wave_lengths = open_waveforms()
+        # Undecodable rows would train as empty clips with real labels
+        missing = wave_lengths[train_idx] == 0
+        if missing.any():
+            print(f"⚠️ Dropping {int(missing.sum())} training clips without a waveform")
+            train_idx = train_idx[~missing]
+        train_ds, stream = make_augmented_dataset(waves, wave_lengths, y, train_idx,
+                                                  batch_size=batch_size,
+                                                  workers=augment_workers, lengths=lengths)
+        print(f"🎛 Augmenting on the fly with {stream.workers} workers")
+    else:
+        train_ds = make_tf_dataset(X, y, train_idx, batch_size=batch_size, shuffle=True,
+                                   lengths=lengths)
+    val_ds = make_tf_dataset(X, y, test_idx, batch_size=batch_size, lengths=lengths)
 
-    model = build_emotion_model(input_shape=(200, 40), num_classes=4)
+    # Time axis left open: the model takes any number of frames
+    model = build_emotion_model(input_shape=(None, N_MFCC), num_classes=4, variant=variant)
 
     checkpoint = ModelCheckpoint(
-        "emotion_model.h5",
+        model_path,
         monitor='val_accuracy',
         save_best_only=True,
         verbose=1
     )
 
-    print("🚀 Starting training...")
-    model.fit(
-        X_train,
-        y_train,
-        epochs=40,
-        batch_size=32,
-        validation_data=(X_test, y_test),
-        callbacks=[checkpoint]
-    )
+    print(f"🚀 Starting training ({variant}, {model.count_params():,} params)...")
+    try:
+        history = model.fit(
+            train_ds,
+            epochs=epochs,
+            validation_data=val_ds,
+            callbacks=[checkpoint]
+        )
+    finally:
+        if stream is not None:
+            stream.close()
+            print(f"🎛 Training waited {stream.waited_s:.1f}s on augmented data in total")
 
-    print("🎉 Training complete. Best model saved as emotion_model.h5")
+    best = max(history.history["val_accuracy"])
+    print(f"🎉 Training complete. Best model saved as {model_path} (val_accuracy {best:.3f})")
+    return model_path, best
 
 
 if __name__ == "__main__":
-    train()
+    parser = argparse.ArgumentParser(description="Train the emotion model")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="feature extraction processes (0 = all cores)")
+    parser.add_argument("--repack", action="store_true",
+                        help="re-extract features into the packed dataset even if it looks current")
+    parser.add_argument("--variant", default=DEFAULT_VARIANT, choices=list(VARIANTS),
+                        help="model architecture (see models/build_model.py)")
+    parser.add_argument("--epochs", type=int, default=40)
+    parser.add_argument("--no-bucket", action="store_true",
+                        help="train on fixed 200-frame batches instead of length buckets")
+    parser.add_argument("--augment", action="store_true",
+                        help="augment training waveforms on the fly (models/augment.py)")
+    parser.add_argument("--augment-workers", type=int, default=0,
+                        help="augmentation threads (0 = all cores)")
+    args = parser.parse_args()
+
+    train(workers=args.workers or None, repack=args.repack, epochs=args.epochs,
+          variant=args.variant, bucket=not args.no_bucket, augment=args.augment,
+          augment_workers=args.augment_workers or None)
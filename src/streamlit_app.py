@@ -8,37 +8,17 @@ Deploy-ready Streamlit app for Mood Companion.
 """
 
 import os
+import uuid
+import threading
 import streamlit as st
 from pathlib import Path
 
 # app-specific imports (keep your existing code usage)
-from models.predict import predict_emotion
-from utils.emotion_responder import get_response
-from utils.tts_engine import speak
-from utils.user_name_memory import get_name, set_name, FILE as NAME_FILE
-
-# Try several recorder components (community packages name differences)
-AUDIO_RECORDER = None
-RECORDER_NAME = None
-try:
-    # package: audio-recorder-streamlit  -> import audio_recorder
-    from audio_recorder_streamlit import audio_recorder as audio_recorder_func  # type: ignore
-    AUDIO_RECORDER = audio_recorder_func
-    RECORDER_NAME = "audio_recorder_streamlit.audio_recorder"
-except Exception:
-    try:
-        # package: streamlit-audiorecorder -> import audiorecorder
-        from streamlit_audiorecorder import audiorecorder as audio_recorder_func2  # type: ignore
-        AUDIO_RECORDER = audio_recorder_func2
-        RECORDER_NAME = "streamlit_audiorecorder.audiorecorder"
-    except Exception:
-        try:
-            # another variant name
-            from streamlit_audiorecorder import audiorecorder  # type: ignore
-            AUDIO_RECORDER = audiorecorder
-            RECORDER_NAME = "streamlit_audiorecorder.audiorecorder"
-        except Exception:
-            AUDIO_RECORDER = None
+# Heavy modules (TensorFlow via models.predict, pygame via utils.tts_engine)
+# are imported lazily, the first time a recording needs them.
+from utils.emotion_responder import get_response, personalize_reply
+from utils.user_name_memory import get_name, set_name, forget_name
+from utils import metrics
 
 # CONFIG & PATHS
 st.set_page_config(page_title="Mood Companion", layout="centered")
@@ -48,18 +28,85 @@ AUDIO_DIR = (BASE_DIR / ".." / "data" / "audio_samples").resolve()
 MODEL_PATH = (BASE_DIR / "models" / "emotion_model.h5").resolve()
 ASSETS_DIR = (BASE_DIR / "assets").resolve()
 
-AUDIO_DIR.mkdir(parents=True, exist_ok=True)
-ASSETS_DIR.mkdir(parents=True, exist_ok=True)
+# Recordings are analyzed in memory; set MOOD_SAVE_RECORDINGS=1 to also keep them on disk.
+SAVE_RECORDINGS = os.environ.get("MOOD_SAVE_RECORDINGS", "0") == "1"
+# Load the model in the background as soon as the server starts (MOOD_WARMUP=0 to disable).
+WARMUP = os.environ.get("MOOD_WARMUP", "1") == "1"
 
 # Fallback avatar (session file you uploaded earlier)
 FALLBACK_AVATAR = "/mnt/data/Screenshot 2025-11-25 091414.png"
 
-AVATAR_MAP = {
-    "neutral": str(ASSETS_DIR / "avatar_neutral.gif") if (ASSETS_DIR / "avatar_neutral.gif").exists() else FALLBACK_AVATAR,
-    "happy":   str(ASSETS_DIR / "avatar_happy.gif")   if (ASSETS_DIR / "avatar_happy.gif").exists()   else FALLBACK_AVATAR,
-    "sad":     str(ASSETS_DIR / "avatar_sad.gif")     if (ASSETS_DIR / "avatar_sad.gif").exists()     else FALLBACK_AVATAR,
-    "angry":   str(ASSETS_DIR / "avatar_angry.gif")   if (ASSETS_DIR / "avatar_angry.gif").exists()   else FALLBACK_AVATAR,
-}
+# -------------------------------------------------------
+# Process-wide resources: built once, shared by every rerun and session
+# -------------------------------------------------------
+@st.cache_resource
+def load_recorder():
+    """Try several recorder components (community packages name differences)."""
+    try:
+        # package: audio-recorder-streamlit  -> import audio_recorder
+        from audio_recorder_streamlit import audio_recorder as audio_recorder_func  # type: ignore
+        return audio_recorder_func, "audio_recorder_streamlit.audio_recorder"
+    except Exception:
+        pass
+    try:
+        # package: streamlit-audiorecorder -> import audiorecorder
+        from streamlit_audiorecorder import audiorecorder as audio_recorder_func2  # type: ignore
+        return audio_recorder_func2, "streamlit_audiorecorder.audiorecorder"
+    except Exception:
+        pass
+    try:
+        # another variant name
+        from streamlit_audiorecorder import audiorecorder  # type: ignore
+        return audiorecorder, "streamlit_audiorecorder.audiorecorder"
+    except Exception:
+        return None, None
+
+@st.cache_resource
+def load_avatars():
+    """Avatar GIF bytes per emotion, read from disk once."""
+    AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+    ASSETS_DIR.mkdir(parents=True, exist_ok=True)
+
+    avatars = {}
+    for emotion in ("neutral", "happy", "sad", "angry"):
+        path = ASSETS_DIR / f"avatar_{emotion}.gif"
+        avatars[emotion] = path.read_bytes() if path.exists() else FALLBACK_AVATAR
+    return avatars
+
+@st.cache_resource
+def load_classifier():
+    # Imports TensorFlow; blocks on the warm-up thread's load if it is still running.
+    # With MOOD_INFERENCE_URL set this is a client of the shared inference server.
+    from inference_client import get_predictor
+    classifier = get_predictor(str(MODEL_PATH))
+    try:
+        with metrics.span("model_load", app="streamlit"):
+            classifier.load()
+    except Exception as e:
+        # predict() falls back to random output, same as before
+        print("⚠️ Could not load model:", e)
+    return classifier
+
+@st.cache_resource
+def start_warmup():
+    thread = threading.Thread(target=load_classifier, name="model-warmup", daemon=True)
+    thread.start()
+    return thread
+
+def session_user_id():
+    """Stable id for this browser: kept in the URL (?uid=...) so it survives reloads."""
+    if "user_id" not in st.session_state:
+        uid = st.query_params.get("uid")
+        if not uid:
+            uid = uuid.uuid4().hex
+            st.query_params["uid"] = uid
+        st.session_state["user_id"] = uid
+    return st.session_state["user_id"]
+
+AUDIO_RECORDER, RECORDER_NAME = load_recorder()
+AVATAR_MAP = load_avatars()
+if WARMUP:
+    start_warmup()
 
 # UI header
 st.markdown("<h1 style='text-align:center; color:#f3a742;'>Your Mood Companion</h1>", unsafe_allow_html=True)
@@ -74,22 +121,22 @@ with col_left:
 
     st.markdown("---")
     st.write("Saved name (optional):")
-    stored_name = get_name()
+    user_id = session_user_id()
+    stored_name = get_name(user_id)
     name_input = st.text_input("Your name", value=stored_name or "")
 
     c1, c2 = st.columns(2)
     with c1:
         if st.button("Save name"):
             if name_input.strip():
-                set_name(name_input.strip())
+                set_name(name_input.strip(), user_id=user_id)
                 st.success(f"Saved name: {name_input.strip()}")
             else:
                 st.warning("Please enter a non-empty name.")
     with c2:
         if st.button("Forget name"):
             try:
-                if os.path.exists(NAME_FILE):
-                    os.remove(NAME_FILE)
+                forget_name(user_id)
                 st.success("Name forgotten.")
             except Exception as e:
                 st.error(f"Could not forget name: {e}")
@@ -134,38 +181,53 @@ except TypeError:
 except Exception:
     audio_bytes = None
 
-# Helper to persist bytes to a .wav file
-def save_audio_bytes_to_wav(raw_bytes, out_path: Path) -> bool:
-    if raw_bytes is None:
-        return False
+def _as_bytes(raw_bytes):
+    # raw_bytes may be bytes, bytearray, memoryview or similar
+    if isinstance(raw_bytes, (bytes, bytearray)):
+        return bytes(raw_bytes)
+    if hasattr(raw_bytes, "tobytes"):
+        return raw_bytes.tobytes()
+    # attempt to convert
+    return bytes(raw_bytes)
+
+def save_recording(raw_bytes):
+    """Keep a recording in the audio spool (FLAC, unique sharded name, size/age quotas)."""
     try:
-        # raw_bytes may be bytes, bytearray, memoryview or similar
-        if isinstance(raw_bytes, (bytes, bytearray)):
-            data = bytes(raw_bytes)
-        elif hasattr(raw_bytes, "tobytes"):
-            data = raw_bytes.tobytes()
-        else:
-            # attempt to convert
-            data = bytes(raw_bytes)
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(out_path, "wb") as f:
-            f.write(data)
-        return True
+        from utils.audio_spool import get_spool
+        with metrics.span("save_audio", app="streamlit"):
+            return get_spool(str(AUDIO_DIR)).write_bytes(_as_bytes(raw_bytes), prefix="ui_sample")
     except Exception as e:
-        st.error(f"Failed saving audio: {e}")
-        return False
+        # Runs off the script thread, so log instead of st.error
+        print(f"Failed saving audio: {e}")
+        return None
+
+def save_recording_async(raw_bytes):
+    """Persist a recording in the background (never blocks the reply)."""
+    threading.Thread(target=save_recording, args=(raw_bytes,), daemon=True).start()
 
-# When audio is present, save and run pipeline
+# When audio is present, run the pipeline straight from memory
 if audio_bytes:
-    status_box.info("Saving and analyzing your voice...")
-    wav_path = AUDIO_DIR / "ui_sample.wav"
-    ok = save_audio_bytes_to_wav(audio_bytes, wav_path)
-    if not ok:
-        status_box.error("Failed to save audio. Try again.")
-    else:
-        # Run prediction (predict_emotion handles model loading)
+    status_box.info("Analyzing your voice...")
+    try:
+        data = _as_bytes(audio_bytes)
+    except Exception as e:
+        data = None
+        status_box.error(f"Could not read recorded audio: {e}")
+
+    if data:
+        if SAVE_RECORDINGS:
+            save_recording_async(data)
+
+        # Run prediction (the WAV bytes are decoded in memory)
         try:
-            emotion, probs = predict_emotion(str(wav_path), model_path=str(MODEL_PATH))
+            from features.mfcc_extractor import extract_mfcc
+            classifier = load_classifier()
+            with metrics.span("extract_mfcc", app="streamlit"):
+                mfcc = extract_mfcc(data, max_pad_len=None)
+            emotion, probs = None, None
+            if mfcc is not None:
+                with metrics.span("predict", app="streamlit"):
+                    emotion, probs = classifier.predict(mfcc)
         except Exception as e:
             emotion, probs = None, None
             status_box.error(f"Prediction error: {e}")
@@ -178,23 +240,27 @@ if audio_bytes:
             probs_box.write(probs)
 
             # build reply and personalize with stored name
-            reply = get_response(emotion)
-            user = get_name()
-            if user:
-                # polite personalization
-                if reply and reply[0].isalpha():
-                    reply = f"{user}, {reply[0].lower()}{reply[1:]}"
-                else:
-                    reply = f"{user}, {reply}"
+            # (same rules as the CLI, so pre-warmed TTS cache entries match)
+            with metrics.span("reply", app="streamlit"):
+                reply = personalize_reply(get_response(emotion), get_name(user_id))
 
             reply_box.markdown("### 💬 Assistant reply:")
             reply_box.write(reply)
 
             # Speak reply (your utils.tts_engine.speak should handle edge-tts or fallback)
             try:
-                speak(reply)
+                from utils.tts_engine import speak
+                with metrics.span("tts", app="streamlit"):
+                    speak(reply)
             except Exception as e:
                 st.error(f"TTS failed: {e}")
 
+            metrics.inc("turns", app="streamlit", emotion=emotion)
+        metrics.export()
+
+if metrics.ENABLED:
+    with st.expander("Metrics (Prometheus snapshot)"):
+        st.code(metrics.prometheus_text(), language="text")
+
 st.markdown("---")
 st.write("Tip: Save a name to personalize replies. This UI uses browser recording (works on phone).")
@@ -1,6 +1,8 @@
 import os
+import sys
+import json
+import itertools
 import tkinter as tk
-from tkinter import ttk
 from PIL import Image, ImageTk, ImageSequence
 import threading
 import subprocess
@@ -14,32 +16,148 @@ AVATAR_MAP = {
     "neutral": "avatar_neutral.gif",
 }
 
+AVATAR_SIZE = (250, 250)
+FRAME_DELAY_MS = 80  # animation speed
+
+# -------------------------------------------------------------------
+# Avatar frames: decoded and resized once at startup
+# -------------------------------------------------------------------
+
+class AvatarManager:
+    """Holds ready-to-show frames for every avatar in AVATAR_MAP.
+
+    Each avatar is a list of (PhotoImage, delay_ms). Consecutive identical
+    frames are merged into one longer frame, so a still image saved as a
+    GIF (gif_maker writes [img, img]) ends up as a single frame and never
+    needs a timer. Must be created after the Tk root.
+    """
+
+    def __init__(self, asset_dir=ASSET_DIR, avatar_map=AVATAR_MAP, size=AVATAR_SIZE):
+        self.size = size
+        self.frames = {
+            emotion: self._load(os.path.join(asset_dir, filename))
+            for emotion, filename in avatar_map.items()
+        }
+
+    def _load(self, gif_path):
+        frames = []
+        last_bytes = None
+        gif = Image.open(gif_path)
+        for frame in ImageSequence.Iterator(gif):
+            frame = frame.convert("RGBA").resize(self.size)
+            data = frame.tobytes()
+            if data == last_bytes:
+                photo, delay = frames[-1]
+                frames[-1] = (photo, delay + FRAME_DELAY_MS)
+                continue
+            last_bytes = data
+            frames.append((ImageTk.PhotoImage(frame), FRAME_DELAY_MS))
+        return frames
+
+    def get(self, emotion):
+        return self.frames.get(emotion) or self.frames["neutral"]
+
+
 # -------------------------------------------------------------------
 # Animated GIF Player
 # -------------------------------------------------------------------
 
 class GIFLabel(tk.Label):
-    def __init__(self, master, gif_path, *args, **kwargs):
+    """One persistent label; set_frames() swaps the animation in place."""
+
+    def __init__(self, master, frames, *args, **kwargs):
         super().__init__(master, *args, **kwargs)
 
-        self.gif_path = gif_path
         self.frames = []
-        self.load_frames()
+        self.idx = 0
+        self._after_id = None
+        self.set_frames(frames)
+
+    def set_frames(self, frames):
+        if frames is self.frames:
+            return
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
 
+        self.frames = frames
         self.idx = 0
         self.play()
 
-    def load_frames(self):
-        gif = Image.open(self.gif_path)
-        for frame in ImageSequence.Iterator(gif):
-            frame = frame.resize((250, 250))  # Avatar size
-            self.frames.append(ImageTk.PhotoImage(frame))
-
     def play(self):
-        frame = self.frames[self.idx]
+        frame, delay = self.frames[self.idx]
         self.configure(image=frame)
-        self.idx = (self.idx + 1) % len(self.frames)
-        self.after(80, self.play)  # animation speed
+        self._after_id = None
+
+        # Single-frame avatars are static: no timer at all
+        if len(self.frames) > 1:
+            self.idx = (self.idx + 1) % len(self.frames)
+            self._after_id = self.after(delay, self.play)
+
+
+# -------------------------------------------------------------------
+# Backend worker (inference_worker.py), started once
+# -------------------------------------------------------------------
+
+class WorkerClient:
+    """Talks JSON lines to one long-lived inference_worker.py process.
+
+    request() returns immediately; the response is passed to callback on the
+    reader thread (use root.after to touch Tk from it).
+    """
+
+    def __init__(self, on_event=None):
+        self.on_event = on_event
+        self._ids = itertools.count(1)
+        self._callbacks = {}
+        self._lock = threading.Lock()
+        self.process = None
+        self.start()
+
+    def start(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-u", "inference_worker.py"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        threading.Thread(target=self._read, args=(self.process,), daemon=True).start()
+
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def request(self, op, callback=None, **params):
+        if not self.alive():
+            self.start()  # crashed: bring up a fresh worker
+        rid = next(self._ids)
+        with self._lock:
+            self._callbacks[rid] = callback
+            self.process.stdin.write(json.dumps(dict(params, id=rid, op=op)) + "\n")
+            self.process.stdin.flush()
+        return rid
+
+    def close(self):
+        if self.alive():
+            try:
+                self.request("shutdown")
+                self.process.wait(timeout=3)
+            except Exception:
+                self.process.kill()
+
+    def _read(self, process):
+        for line in process.stdout:
+            try:
+                msg = json.loads(line)
+            except ValueError:
+                continue
+            with self._lock:
+                callback = self._callbacks.pop(msg.get("id"), None)
+            if callback:
+                callback(msg)
+            elif self.on_event:
+                self.on_event(msg)
 
 
 # -------------------------------------------------------------------
@@ -67,11 +185,9 @@ class MoodCompanionUI:
         self.avatar_box = tk.Frame(root, bg="#101820")
         self.avatar_box.pack(pady=20)
 
-        # Default avatar
-        self.avatar_label = GIFLabel(
-            self.avatar_box,
-            os.path.join(ASSET_DIR, AVATAR_MAP["neutral"])
-        )
+        # Default avatar (all avatars are decoded once, here)
+        self.avatars = AvatarManager()
+        self.avatar_label = GIFLabel(self.avatar_box, self.avatars.get("neutral"))
         self.avatar_label.pack()
 
         # Text output box
@@ -87,8 +203,8 @@ class MoodCompanionUI:
         )
         self.output_text.pack(pady=15)
 
-        # Record Button
-        record_btn = tk.Button(
+        # Record Button (press to start, press again to stop)
+        self.record_btn = tk.Button(
             root,
             text="🎙 Speak",
             font=("Helvetica", 16, "bold"),
@@ -96,40 +212,93 @@ class MoodCompanionUI:
             fg="black",
             padx=20,
             pady=10,
-            command=self.start_voice_process
+            command=self.toggle_recording
+        )
+        self.record_btn.pack(pady=(30, 5))
+
+        cancel_btn = tk.Button(
+            root,
+            text="Cancel",
+            font=("Helvetica", 10),
+            command=self.cancel
         )
-        record_btn.pack(pady=30)
+        cancel_btn.pack()
+
+        self.root = root
+        self.recording = False
+        self.worker = WorkerClient(on_event=lambda msg: self.ui(self.on_worker_event, msg))
+        root.protocol("WM_DELETE_WINDOW", self.close)
+
+    # -------------------------------------------------------------------
+    # Worker plumbing (responses arrive on the reader thread)
+    # -------------------------------------------------------------------
+    def ui(self, fn, *args):
+        self.root.after(0, fn, *args)
+
+    def write(self, text, clear=False):
+        if clear:
+            self.output_text.delete(1.0, tk.END)
+        self.output_text.insert(tk.END, text)
+        self.output_text.see(tk.END)
+
+    def on_worker_event(self, msg):
+        if msg.get("event") == "ready":
+            self.worker.request("health", lambda m: self.ui(self.on_health, m))
+
+    def on_health(self, msg):
+        state = "model ready" if msg.get("model_loaded") else "loading model..."
+        self.write(f"Backend up ({state}).\n")
 
     # -------------------------------------------------------------------
     # Trigger backend voice system
     # -------------------------------------------------------------------
-    def start_voice_process(self):
-        self.output_text.delete(1.0, tk.END)
-        self.output_text.insert(tk.END, "Listening... Speak now.\n")
-
-        def worker():
-            # Run your voice companion script
-            process = subprocess.Popen(
-                ["python", "voice_companion.py"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=os.path.dirname(__file__)
-            )
-
-            # Read output live
-            for line in process.stdout:
-                if "Detected Emotion:" in line:
-                    emotion = line.split(":")[1].strip().lower()
-                    if emotion in AVATAR_MAP:
-                        gif_path = os.path.join(ASSET_DIR, AVATAR_MAP[emotion])
-                        self.avatar_label = GIFLabel(self.avatar_box, gif_path)
-                        self.avatar_label.pack()
-
-                self.output_text.insert(tk.END, line)
-                self.output_text.see(tk.END)
-
-        threading.Thread(target=worker).start()
+    def toggle_recording(self):
+        if not self.recording:
+            self.write("Listening... Speak now, then press Stop.\n", clear=True)
+            self.worker.request("start_recording", lambda m: self.ui(self.on_recording, m))
+        else:
+            self.record_btn.configure(text="⏳ Thinking...", state=tk.DISABLED)
+            self.worker.request("stop_recording", lambda m: self.ui(self.on_result, m))
+
+    def on_recording(self, msg):
+        if not msg.get("ok"):
+            self.write(f"Could not start recording: {msg.get('error')}\n")
+            return
+        self.recording = True
+        self.record_btn.configure(text="⏹ Stop")
+
+    def on_result(self, msg):
+        self.recording = False
+        self.record_btn.configure(text="🎙 Speak", state=tk.NORMAL)
+
+        if msg.get("cancelled"):
+            self.write("Cancelled.\n")
+            return
+        if not msg.get("ok"):
+            self.write(f"Something went wrong: {msg.get('error')}\n")
+            return
+
+        self.show_emotion(msg["emotion"])
+        probs = ", ".join(f"{e} {p:.2f}" for e, p in msg["probs"].items())
+        timings = msg["timings"]
+        self.write(f"Detected Emotion: {msg['emotion'].capitalize()}\n", clear=True)
+        self.write(f"Probabilities: {probs}\n\n")
+        self.write(f"💬 {msg['reply']}\n\n")
+        self.write(f"⏱ {timings['total_ms']:.0f} ms (predict {timings['predict_ms']:.0f} ms)\n")
+
+    def show_emotion(self, emotion):
+        if emotion in AVATAR_MAP:
+            self.avatar_label.set_frames(self.avatars.get(emotion))
+
+    def cancel(self):
+        self.worker.request("cancel")
+        if self.recording:
+            self.recording = False
+            self.record_btn.configure(text="🎙 Speak", state=tk.NORMAL)
+
+    def close(self):
+        self.worker.close()
+        self.root.destroy()
 
 
 # -------------------------------------------------------------------
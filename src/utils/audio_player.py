@@ -0,0 +1,269 @@
+"""
+Background playback engine for TTS replies.
+
+One persistent pygame mixer and one worker thread play a queue of
+utterances back to back. Waiting is event driven: the worker sleeps on a
+threading.Event for the length of the sound, so nothing spins while audio
+plays, and stop()/interrupt() wake it immediately.
+
+Utterances can be a file (play) or a stream of encoded audio chunks
+(open_stream + feed/close); streamed audio starts playing as soon as the
+first few KB arrive instead of after the whole sentence is synthesized.
+"""
+
+import io
+import time
+import queue
+import asyncio
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+import pygame
+
+# Streamed audio is cut into segments: a small first one for a fast start,
+# bigger ones afterwards (fewer segment boundaries). ~1.3s / ~5s at 48 kbps.
+# Segments are decoded independently and cut only on MP3 frame boundaries
+# (edge-tts streams headerless MP3), so no frame is split between two.
+FIRST_SEGMENT_BYTES = 8 * 1024
+SEGMENT_BYTES = 32 * 1024
+
+# Layer III bitrates (kbps) and sample rates, indexed by MPEG version bits
+_MP3_BITRATES = {
+    3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),   # MPEG-1
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),       # MPEG-2
+    0: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),       # MPEG-2.5
+}
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def mp3_frame_end(data, pos):
+    """End offset of the first complete Layer III frame at or after pos.
+
+    Bytes that aren't a frame header (ID3 tags, garbage) are skipped one at
+    a time. None if no complete frame is available yet.
+    """
+    while pos + 4 <= len(data):
+        b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+        version, layer = (b1 >> 3) & 3, (b1 >> 1) & 3
+        bitrate_idx, rate_idx = b2 >> 4, (b2 >> 2) & 3
+        if (data[pos] != 0xFF or (b1 & 0xE0) != 0xE0 or version == 1 or layer != 1
+                or bitrate_idx in (0, 15) or rate_idx == 3):
+            pos += 1
+            continue
+        bitrate = _MP3_BITRATES[version][bitrate_idx] * 1000
+        sample_rate = _MP3_SAMPLE_RATES[version][rate_idx]
+        size = (144 if version == 3 else 72) * bitrate // sample_rate + ((b2 >> 1) & 1)
+        end = pos + size
+        return end if end <= len(data) else None
+    return None
+
+
+class Utterance:
+    """Handle for one queued piece of audio.
+
+    done() / wait() / add_done_callback(), or `await utterance`. The result
+    is True if it played to the end, False if it was stopped or interrupted.
+    """
+
+    def __init__(self, path=None, on_done=None):
+        self.path = path
+        self.future = Future()
+        # Set when the first sound is audible (or when it ends without playing)
+        self.started = threading.Event()
+        self._chunks = queue.Queue() if path is None else None
+        if on_done:
+            self.future.add_done_callback(lambda f: on_done(f.result()))
+
+    # -- streaming input ---------------------------------------------------
+    def feed(self, data):
+        self._chunks.put(data)
+
+    def close(self):
+        self._chunks.put(None)
+
+    # -- completion ----------------------------------------------------------
+    def done(self):
+        return self.future.done()
+
+    def wait(self, timeout=None):
+        """Block until playback ends; returns the result (None on timeout)."""
+        try:
+            return self.future.result(timeout)
+        except FutureTimeout:
+            return None
+
+    def add_done_callback(self, fn):
+        self.future.add_done_callback(lambda f: fn(f.result()))
+
+    def __await__(self):
+        return asyncio.wrap_future(self.future).__await__()
+
+    def _finish(self, completed):
+        self.started.set()
+        if not self.future.done():
+            self.future.set_result(completed)
+
+
+class AudioPlayer:
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._wake = threading.Event()     # set by stop() to cut the current sound
+        self._lock = threading.Lock()
+        self._generation = 0               # bumped by stop(); older queued utterances are dropped
+        self._thread = None
+        self._channel = None
+        self.current = None
+
+    # -- public API ------------------------------------------------------------
+    def play(self, path, on_done=None):
+        """Queue an audio file; returns its Utterance."""
+        return self._submit(Utterance(path, on_done))
+
+    def open_stream(self, on_done=None):
+        """Queue a streamed utterance; feed() it encoded chunks, then close()."""
+        return self._submit(Utterance(None, on_done))
+
+    def stop(self):
+        """Stop what is playing and drop everything queued.
+
+        Queued utterances aren't pulled out of the queue here (a clip queued
+        by another thread right after this call must survive); the worker
+        finishes every utterance submitted before the stop without playing it.
+        """
+        with self._lock:
+            self._generation += 1
+            current = self.current
+            self._wake.set()
+        if current is not None and current._chunks is not None:
+            current._chunks.put(None)  # unblock a stream waiting for chunks
+
+    def interrupt(self, path, on_done=None):
+        """Cut whatever is playing and play path next."""
+        self.stop()
+        return self.play(path, on_done)
+
+    def busy(self):
+        return self.current is not None or not self._queue.empty()
+
+    # -- worker ------------------------------------------------------------------
+    def _submit(self, utterance):
+        with self._lock:
+            if self._channel is None:
+                # Here rather than on the worker so a mixer failure reaches the caller
+                pygame.mixer.init()
+                self._channel = pygame.mixer.Channel(0)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            utterance._generation = self._generation
+        self._queue.put(utterance)
+        return utterance
+
+    def _run(self):
+        while True:
+            utterance = self._queue.get()
+            with self._lock:
+                # Under the lock: a stop() from here on sets _wake after this clear
+                stale = utterance._generation != self._generation   # queued before a stop()
+                if not stale and not utterance.done():
+                    self.current = utterance
+                    self._wake.clear()
+            if self.current is not utterance:
+                utterance._finish(False)
+                continue
+            try:
+                if utterance.path is not None:
+                    completed = self._play_file(utterance)
+                else:
+                    completed = self._play_stream(utterance)
+            except Exception as e:
+                print("⚠️ Playback failed:", e)
+                completed = False
+            finally:
+                self._channel.stop()
+                self.current = None
+            utterance._finish(completed)
+
+    def _sleep_until(self, deadline):
+        """Wait for deadline; False if stop() woke us first."""
+        return not self._wake.wait(max(0.0, deadline - time.monotonic()))
+
+    def _drain(self):
+        # The mixer can lag the clock by a buffer or two; wait that out too.
+        while self._channel.get_busy():
+            if self._wake.wait(0.01):
+                return False
+        return True
+
+    def _play_file(self, utterance):
+        sound = pygame.mixer.Sound(utterance.path)
+        self._channel.play(sound)
+        utterance.started.set()
+        return self._sleep_until(time.monotonic() + sound.get_length()) and self._drain()
+
+    def _play_stream(self, utterance):
+        # One segment plays while the next sits in the channel's queue slot.
+        playing_end = scheduled_end = time.monotonic()
+        threshold = FIRST_SEGMENT_BYTES
+        pending = bytearray()
+        scanned = 0       # pending[:scanned] is whole frames
+
+        def schedule(data):
+            nonlocal playing_end, scheduled_end
+            try:
+                sound = pygame.mixer.Sound(file=io.BytesIO(bytes(data)))
+            except pygame.error as e:
+                # A segment the decoder can't sync to: skip it rather than the whole reply
+                print("⚠️ Skipping undecodable audio segment:", e)
+                return True
+            length = sound.get_length()
+
+            if not self._channel.get_busy():
+                self._channel.play(sound)
+                utterance.started.set()
+                playing_end = scheduled_end = time.monotonic() + length
+                return True
+
+            if self._channel.get_queue() is not None:
+                # Queue slot taken: wait for the current segment to finish.
+                if not self._sleep_until(playing_end):
+                    return False
+                playing_end = scheduled_end
+            self._channel.queue(sound)
+            scheduled_end += length
+            return True
+
+        while True:
+            data = utterance._chunks.get()
+            if self._wake.is_set():
+                return False
+            if data is None:
+                break
+            pending += data
+            while True:
+                end = mp3_frame_end(pending, scanned)
+                if end is None:
+                    break
+                scanned = end
+                if scanned >= threshold:
+                    if not schedule(pending[:scanned]):
+                        return False
+                    del pending[:scanned]
+                    scanned = 0
+                    threshold = SEGMENT_BYTES
+
+        if pending and not schedule(pending):
+            return False
+        return self._sleep_until(scheduled_end) and self._drain()
+
+
+_player = None
+_player_lock = threading.Lock()
+
+def get_player():
+    """Process-wide player (one mixer, one playback thread)."""
+    global _player
+    with _player_lock:
+        if _player is None:
+            _player = AudioPlayer()
+        return _player
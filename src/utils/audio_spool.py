@@ -0,0 +1,208 @@
+"""
+Bounded, compressed spool for recordings kept on disk (data/audio_samples).
+
+- unique names: <prefix>_<YYYYmmdd_HHMMSS>_<8 hex>.flac, never collide
+- FLAC (lossless, about half the size of 16-bit WAV; soundfile/libsndfile
+  read it back directly, so extract_mfcc works on spooled files as before)
+- sharded layout: <root>/<YYYYmmdd>/<2 hex>/<name>, so no directory grows
+  past a few hundred entries and age cleanup drops whole day folders
+- quotas: max_bytes total and max_age_days, enforced by a background
+  thread (on start, every evict_interval seconds and when a write pushes
+  the spool over max_bytes). Size eviction removes the oldest days first,
+  down to 90% of max_bytes.
+
+Defaults come from MOOD_SPOOL_MAX_MB (2048), MOOD_SPOOL_MAX_DAYS (30) and
+MOOD_SPOOL_FORMAT (flac | wav).
+"""
+
+import io
+import os
+import time
+import uuid
+import shutil
+import threading
+from datetime import datetime, timedelta
+
+import soundfile as sf
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_ROOT = os.path.join(PROJECT_ROOT, "data", "audio_samples")
+DEFAULT_MAX_BYTES = int(os.environ.get("MOOD_SPOOL_MAX_MB", "2048")) * 1024 ** 2
+DEFAULT_MAX_AGE_DAYS = float(os.environ.get("MOOD_SPOOL_MAX_DAYS", "30"))
+DEFAULT_FORMAT = os.environ.get("MOOD_SPOOL_FORMAT", "flac").lower()
+
+AUDIO_EXTS = (".flac", ".wav")
+DAY_FORMAT = "%Y%m%d"
+
+
+class AudioSpool:
+    def __init__(self, root=DEFAULT_ROOT, max_bytes=DEFAULT_MAX_BYTES,
+                 max_age_days=DEFAULT_MAX_AGE_DAYS, fmt=DEFAULT_FORMAT,
+                 evict_interval=300, min_keep_s=60):
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.fmt = fmt
+        self.ext = "." + fmt
+        self.evict_interval = evict_interval
+        self.min_keep_s = min_keep_s   # never evict files this fresh (they may be in use)
+
+        os.makedirs(self.root, exist_ok=True)
+        self._bytes = None              # total size, known after the first scan
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        threading.Thread(target=self._evict_loop, name="spool-evict", daemon=True).start()
+
+    # -- writing ---------------------------------------------------------------
+    def new_path(self, prefix="sample", ext=None):
+        now = datetime.now()
+        uid = uuid.uuid4().hex[:8]
+        folder = os.path.join(self.root, now.strftime(DAY_FORMAT), uid[:2])
+        os.makedirs(folder, exist_ok=True)
+        return os.path.join(folder, f"{prefix}_{now.strftime('%Y%m%d_%H%M%S')}_{uid}{ext or self.ext}")
+
+    def write(self, audio, sample_rate, prefix="sample"):
+        """Store a (samples,) or (samples, channels) array. Returns the file path."""
+        path = self.new_path(prefix)
+        tmp = path + ".tmp"
+        sf.write(tmp, audio, sample_rate, format=self.fmt.upper(), subtype="PCM_16")
+        os.replace(tmp, path)
+        self._added(os.path.getsize(path))
+        return path
+
+    def write_bytes(self, data, prefix="sample"):
+        """Store encoded audio (e.g. browser WAV bytes), re-encoded to the spool format.
+
+        Audio libsndfile can't decode is stored as-is.
+        """
+        try:
+            audio, sample_rate = sf.read(io.BytesIO(data), dtype="int16")
+        except Exception:
+            path = self.new_path(prefix, ext=".bin")
+            with open(path, "wb") as f:
+                f.write(data)
+            self._added(len(data))
+            return path
+        return self.write(audio, sample_rate, prefix)
+
+    def _added(self, size):
+        with self._lock:
+            if self._bytes is not None:
+                self._bytes += size
+                if self._bytes > self.max_bytes:
+                    self._wake.set()
+
+    # -- listing & eviction ----------------------------------------------------------
+    def _days(self):
+        """Day folders, oldest first."""
+        days = []
+        for entry in os.scandir(self.root):
+            if entry.is_dir():
+                try:
+                    days.append((datetime.strptime(entry.name, DAY_FORMAT), entry.path))
+                except ValueError:
+                    pass   # not one of ours
+        return sorted(days)
+
+    @staticmethod
+    def _files(day_path):
+        for shard in os.scandir(day_path):
+            if shard.is_dir():
+                for entry in os.scandir(shard.path):
+                    if entry.is_file() and not entry.name.endswith(".tmp"):
+                        yield entry
+
+    def files(self):
+        """Every spooled file path, oldest day first."""
+        for _, day_path in self._days():
+            for entry in self._files(day_path):
+                yield entry.path
+
+    def evict(self):
+        """Apply the age and size quotas. Returns (files removed, bytes freed)."""
+        removed = freed = 0
+        now = time.time()
+        cutoff = datetime.now() - timedelta(days=self.max_age_days)
+
+        days = []
+        for day, day_path in self._days():
+            # Whole day folders past the age limit go in one call
+            if day + timedelta(days=1) <= cutoff:
+                stats = [e.stat().st_size for e in self._files(day_path)]
+                shutil.rmtree(day_path, ignore_errors=True)
+                removed += len(stats)
+                freed += sum(stats)
+            else:
+                days.append((day, day_path))
+
+        entries = []
+        for _, day_path in days:
+            for entry in self._files(day_path):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9) if total > self.max_bytes else total
+
+        for mtime, size, path in entries:
+            too_old = mtime < cutoff.timestamp()
+            if not too_old and total <= target:
+                break
+            if now - mtime < self.min_keep_s:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+            freed += size
+
+        # Only days that ended a while ago: new_path() creates today's
+        # folders before the file is written into them
+        settled = datetime.now() - timedelta(seconds=self.min_keep_s)
+        for day, day_path in days:
+            if day + timedelta(days=1) <= settled:
+                self._prune_empty(day_path)
+
+        with self._lock:
+            self._bytes = total
+        if removed:
+            print(f"🧹 Audio spool: removed {removed} files ({freed / 1024 ** 2:.1f} MB)")
+        return removed, freed
+
+    @staticmethod
+    def _prune_empty(day_path):
+        for shard in os.scandir(day_path):
+            if shard.is_dir():
+                try:
+                    os.rmdir(shard.path)   # only succeeds when empty
+                except OSError:
+                    pass
+        try:
+            os.rmdir(day_path)
+        except OSError:
+            pass
+
+    def _evict_loop(self):
+        while True:
+            try:
+                self.evict()
+            except Exception as e:
+                print("⚠️ Audio spool eviction failed:", e)
+            self._wake.wait(self.evict_interval)
+            self._wake.clear()
+
+
+_spools = {}
+_spools_lock = threading.Lock()
+
+
+def get_spool(root=None):
+    """Process-wide spool for root (default data/audio_samples)."""
+    root = os.path.abspath(root or DEFAULT_ROOT)
+    with _spools_lock:
+        spool = _spools.get(root)
+        if spool is None:
+            spool = _spools[root] = AudioSpool(root)
+        return spool
@@ -34,8 +34,40 @@ RESPONSES = {
     ]
 }
 
+FALLBACK_RESPONSE = "Mood thoda confusing lag raha hai… but no worries, I’m right here. Tell me anything."
+
 def get_response(emotion):
     if emotion not in RESPONSES:
-        return "Mood thoda confusing lag raha hai… but no worries, I’m right here. Tell me anything."
+        return FALLBACK_RESPONSE
 
     return random.choice(RESPONSES[emotion])
+
+def personalize_reply(reply: str, user_name: str) -> str:
+    """Insert user_name into reply naturally where sensible."""
+    if not user_name:
+        return reply
+
+    # Simple, safe personalization rules
+    # Prefer injecting after common starters
+    starters = [
+        ("I hear", f"I hear you, {user_name}"),
+        ("You sound", f"You sound, {user_name},"),
+        ("I'm here", f"I'm here for you, {user_name}"),
+        ("There", f"{user_name}, there"),
+    ]
+
+    for prefix, replacement in starters:
+        if reply.startswith(prefix):
+            return reply.replace(prefix, replacement, 1)
+
+    # fallback: prepend name politely
+    # keep capitalization sensible
+    if reply and reply[0].isalpha():
+        return f"{user_name}, {reply[0].lower()}{reply[1:]}"
+    return f"{user_name}, {reply}"
+
+def all_replies(names=()):
+    """Every text get_response can produce, plus its personalized variant for each name."""
+    replies = [r for options in RESPONSES.values() for r in options] + [FALLBACK_RESPONSE]
+    variants = [personalize_reply(r, n) for n in names if n for r in replies]
+    return replies + variants
@@ -0,0 +1,211 @@
+"""
+Lightweight in-process metrics: timing spans, counters and histograms.
+
+Off by default. Enable with MOOD_METRICS=1; while disabled every call is a
+constant-time no-op (span() hands back a shared do-nothing context manager).
+
+    from utils import metrics
+
+    with metrics.span("extract_mfcc"):
+        mfcc = extract_mfcc(path)
+    metrics.inc("turns")
+
+Exports:
+  - Prometheus text format: prometheus_text(), or export() which writes it
+    atomically to MOOD_METRICS_FILE (default data/metrics/mood.prom, ready
+    for node_exporter's textfile collector)
+  - one JSON line per span/event to MOOD_METRICS_LOG ("-" = stderr; unset = no log)
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+
+ENABLED = os.environ.get("MOOD_METRICS", "0") == "1"
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+METRICS_FILE = os.environ.get("MOOD_METRICS_FILE",
+                              os.path.join(PROJECT_ROOT, "data", "metrics", "mood.prom"))
+LOG_TARGET = os.environ.get("MOOD_METRICS_LOG")
+
+PREFIX = "mood_"
+# Histogram upper bounds in seconds, from a cache hit to a cold model load
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+                    for k, v in pairs)
+    return "{" + body + "}"
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+class Registry:
+    """Thread-safe store of counters and histograms, keyed by (name, labels)."""
+
+    def __init__(self, log_target=LOG_TARGET):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._log = None
+        if log_target == "-":
+            self._log = sys.stderr
+        elif log_target:
+            os.makedirs(os.path.dirname(os.path.abspath(log_target)), exist_ok=True)
+            self._log = open(log_target, "a", encoding="utf-8", buffering=1)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = Histogram()
+            hist.observe(value)
+
+    def log(self, event, **fields):
+        if self._log is None:
+            return
+        line = json.dumps({"ts": round(time.time(), 3), "event": event, **fields})
+        with self._lock:
+            self._log.write(line + "\n")
+
+    def prometheus_text(self):
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+
+            seen = set()
+            for (name, key), value in counters:
+                metric = f"{PREFIX}{name}_total"
+                if metric not in seen:
+                    lines.append(f"# TYPE {metric} counter")
+                    seen.add(metric)
+                lines.append(f"{metric}{_format_labels(key)} {value}")
+
+            for (name, key), hist in histograms:
+                metric = f"{PREFIX}{name}"
+                if metric not in seen:
+                    lines.append(f"# TYPE {metric} histogram")
+                    seen.add(metric)
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    lines.append(f"{metric}_bucket{_format_labels(key, [('le', bound)])} {cumulative}")
+                lines.append(f"{metric}_bucket{_format_labels(key, [('le', '+Inf')])} {hist.count}")
+                lines.append(f"{metric}_sum{_format_labels(key)} {hist.sum:.6f}")
+                lines.append(f"{metric}_count{_format_labels(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+class Span:
+    """Times a block into the stage_seconds histogram and logs it as a JSON line."""
+
+    __slots__ = ("stage", "labels", "start")
+
+    def __init__(self, stage, labels):
+        self.stage = stage
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        registry.observe("stage_seconds", elapsed, stage=self.stage, **self.labels)
+        if exc_type is not None:
+            registry.inc("stage_errors", stage=self.stage, **self.labels)
+        registry.log("span", stage=self.stage, duration_ms=round(elapsed * 1000, 3),
+                     ok=exc_type is None, **self.labels)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+registry = Registry() if ENABLED else None
+
+
+def span(stage, **labels):
+    """Context manager timing one pipeline stage (no-op unless MOOD_METRICS=1)."""
+    if not ENABLED:
+        return _NOOP
+    return Span(stage, labels)
+
+
+def inc(name, value=1, **labels):
+    if ENABLED:
+        registry.inc(name, value, **labels)
+
+
+def observe(name, value, **labels):
+    """Record value (seconds for *_seconds histograms) into histogram name."""
+    if ENABLED:
+        registry.observe(name, value, **labels)
+
+
+def event(name, **fields):
+    """Write a structured JSON log line (when a log target is configured)."""
+    if ENABLED:
+        registry.log(name, **fields)
+
+
+def prometheus_text():
+    return registry.prometheus_text() if ENABLED else ""
+
+
+def export(path=METRICS_FILE):
+    """Write the Prometheus snapshot to path atomically. Returns the path, or None if disabled."""
+    if not ENABLED:
+        return None
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Per thread: concurrent exports must not replace each other's temp file
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+    return path
@@ -1,9 +1,9 @@
 import sounddevice as sd
-from scipy.io.wavfile import read
+import soundfile as sf
 
 def play_audio(file_path):
     try:
-        rate, data = read(file_path)
+        data, rate = sf.read(file_path)   # WAV or FLAC (spooled recordings)
         sd.play(data, rate)
         sd.wait()
         print("\n🎧 Playback finished.\n")
@@ -0,0 +1,217 @@
+"""
+Per-user profile store (currently just the preferred name), shared by every
+app and session in a process.
+
+- SQLite in WAL mode: readers never block the writer, and several processes
+  (Streamlit, the CLI, the UI worker) can use the same file.
+- Read-through cache: get_name() is a dict lookup after the first read;
+  entries are re-read after cache_ttl seconds so other processes' writes
+  show up.
+- Write coalescing: set_name()/forget() update the cache immediately and
+  queue the write; a background thread flushes everything queued in one
+  transaction every flush_interval seconds (only the last write per user
+  is stored). flush() forces it; pending writes are flushed at exit.
+
+The legacy single-user utils/user_name.txt is imported once as the default
+user (the file itself is left alone).
+"""
+
+import os
+import time
+import atexit
+import sqlite3
+import threading
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_DB = os.environ.get("MOOD_PROFILE_DB",
+                            os.path.join(PROJECT_ROOT, "data", "profiles.sqlite3"))
+LEGACY_NAME_FILE = os.path.join(os.path.dirname(__file__), "user_name.txt")
+
+DEFAULT_USER = "default"
+
+_DELETE = object()  # queued "forget" marker
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    user_id    TEXT PRIMARY KEY,
+    name       TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class ProfileStore:
+    def __init__(self, db_path=DEFAULT_DB, flush_interval=0.5, cache_ttl=5.0,
+                 legacy_file=LEGACY_NAME_FILE):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.cache_ttl = cache_ttl
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        # One connection, used under _db_lock, shared by callers and the flusher
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._db_lock = threading.Lock()
+
+        self._cache = {}      # user_id -> (name or None, loaded_at)
+        self._pending = {}    # user_id -> name or _DELETE
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+
+        if legacy_file:
+            self._migrate_legacy(legacy_file)
+
+        self._flusher = threading.Thread(target=self._flush_loop, name="profile-flush",
+                                         daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    # -- reads -----------------------------------------------------------------
+    def get_name(self, user_id=DEFAULT_USER):
+        now = time.monotonic()
+        with self._lock:
+            if user_id in self._pending:
+                value = self._pending[user_id]
+                return None if value is _DELETE else value
+            cached = self._cache.get(user_id)
+            if cached is not None and now - cached[1] < self.cache_ttl:
+                return cached[0]
+
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT name FROM profiles WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        name = row[0] if row else None
+
+        with self._lock:
+            if user_id not in self._pending:   # a write raced us; it wins
+                self._cache[user_id] = (name, now)
+        return name
+
+    def names(self):
+        """Every stored name (e.g. to pre-synthesize personalized replies)."""
+        self.flush()
+        with self._db_lock:
+            rows = self._conn.execute("SELECT DISTINCT name FROM profiles").fetchall()
+        return [name for (name,) in rows]
+
+    # -- writes ----------------------------------------------------------------
+    def set_name(self, user_id, name):
+        name = name.strip()
+        if not name:
+            return
+        self._queue(user_id, name)
+
+    def forget(self, user_id=DEFAULT_USER):
+        self._queue(user_id, _DELETE)
+
+    def _queue(self, user_id, value):
+        with self._lock:
+            self._pending[user_id] = value
+            self._cache.pop(user_id, None)
+        self._wake.set()
+
+    def flush(self):
+        """Write every queued change in one transaction.
+
+        Changes stay in _pending (which get_name reads first) until they are
+        committed, so a concurrent read never caches the row from before.
+        """
+        with self._lock:
+            pending = dict(self._pending)
+        if not pending:
+            return 0
+
+        now = time.time()
+        upserts = [(uid, v, now) for uid, v in pending.items() if v is not _DELETE]
+        deletes = [(uid,) for uid, v in pending.items() if v is _DELETE]
+
+        with self._db_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO profiles (user_id, name, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE SET name = excluded.name, "
+                    "updated_at = excluded.updated_at", upserts)
+                self._conn.executemany("DELETE FROM profiles WHERE user_id = ?", deletes)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        mono = time.monotonic()
+        with self._lock:
+            for uid, v in pending.items():
+                # Unless a newer write replaced it meanwhile (that one flushes next)
+                if self._pending.get(uid) is v:
+                    del self._pending[uid]
+                    self._cache[uid] = (None if v is _DELETE else v, mono)
+        return len(pending)
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wake.wait()
+            if self._closed:
+                break
+            # Coalesce: let a burst of writes pile up, then commit them together
+            time.sleep(self.flush_interval)
+            self._wake.clear()
+            if self._closed:
+                break
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print("⚠️ Could not save profiles:", e)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+    # -- migration ---------------------------------------------------------------
+    def _migrate_legacy(self, legacy_file):
+        with self._db_lock:
+            done = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'legacy_name_migrated'"
+            ).fetchone()
+            if done:
+                return
+            try:
+                with open(legacy_file, "r", encoding="utf-8") as f:
+                    name = f.read().strip()
+            except OSError:
+                name = ""
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            if name:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO profiles (user_id, name, updated_at) VALUES (?, ?, ?)",
+                    (DEFAULT_USER, name, time.time()))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_name_migrated', '1')")
+            self._conn.execute("COMMIT")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Process-wide ProfileStore (MOOD_PROFILE_DB overrides the database path)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ProfileStore()
+        return _store
@@ -1,5 +1,11 @@
 import os
+import json
+import time
 import shutil
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # -------------------------------------------------------
 # AUTO-DETECT PROJECT ROOT NO MATTER WHERE SCRIPT IS RUN
@@ -12,6 +18,10 @@ PROJECT_ROOT = os.path.dirname(SRC_DIR)
 RAW_FOLDER = os.path.join(PROJECT_ROOT, "data", "ravdess_raw")
 OUTPUT_FOLDER = os.path.join(PROJECT_ROOT, "data", "processed")
 
+# Written into OUTPUT_FOLDER; models/train_model.py reads it instead of listing folders.
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
 emotion_map = {
     "01": "neutral",
     "02": "neutral",
@@ -20,43 +30,207 @@ emotion_map = {
     "05": "angry",
 }
 
+FICLONE = 0x40049409  # Linux ioctl: copy-on-write clone (btrfs, xfs, ...)
+
+
+def file_sha1(path, block_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _reflink(src, dst):
+    import fcntl
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+
+
+def place_file(src, dst, mode="auto"):
+    """Put src at dst without duplicating data where the filesystem allows.
+
+    mode "auto" tries a hardlink, then a reflink, then falls back to a copy;
+    "hardlink", "reflink" and "copy" force one method. The file appears at
+    dst atomically. Returns the method used.
+    """
+    tmp = f"{dst}.{os.getpid()}.{threading.get_ident()}.tmp"
+    methods = ["hardlink", "reflink", "copy"] if mode == "auto" else [mode]
+
+    for method in methods:
+        try:
+            if method == "hardlink":
+                os.link(src, tmp)
+            elif method == "reflink":
+                _reflink(src, tmp)
+            else:
+                shutil.copy2(src, tmp)
+            os.replace(tmp, dst)
+            return method
+        except (OSError, ImportError):
+            # Cross-device link, no reflink support, no fcntl (Windows)...: next method
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            if method == methods[-1]:
+                raise
+
+
+def read_manifest(out_folder=OUTPUT_FOLDER):
+    """Manifest entries keyed by path relative to out_folder ({} if there is no manifest)."""
+    try:
+        with open(os.path.join(out_folder, MANIFEST_FILE), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest["files"]
+
+
+def write_manifest(entries, out_folder=OUTPUT_FOLDER):
+    path = os.path.join(out_folder, MANIFEST_FILE)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "files": entries}, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def scan_raw(raw_folder=RAW_FOLDER):
+    """Yield (source_path, label) for every RAVDESS wav whose emotion we use."""
+    for root, dirs, files in os.walk(raw_folder):
+        for file in files:
+            if not file.endswith(".wav"):
+                continue
 
-def sort_ravdess():
-    print("🔍 Looking for RAVDESS at:", RAW_FOLDER)
-
-    if not os.path.exists(RAW_FOLDER):
-        print("❌ RAVDESS raw folder not found!")
-        return
+            parts = file.split("-")
+            if len(parts) < 3 or parts[2] not in emotion_map:
+                continue
 
-    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+            yield os.path.join(root, file), emotion_map[parts[2]]
 
-    # Create emotion dirs
-    for emotion in set(emotion_map.values()):
-        os.makedirs(os.path.join(OUTPUT_FOLDER, emotion), exist_ok=True)
 
-    print("📁 Sorting RAVDESS files...\n")
+def _ingest(source, label, out_folder, mode):
+    st = os.stat(source)
+    rel = f"{label}/{os.path.basename(source)}"
+    method = place_file(source, os.path.join(out_folder, rel), mode)
+    return rel, {
+        "source": source,
+        "label": label,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha1": file_sha1(source),
+        "method": method,
+    }
 
-    for root, dirs, files in os.walk(RAW_FOLDER):
-        for file in files:
-            if not file.endswith(".wav"):
-                continue
 
-            file_path = os.path.join(root, file)
-            parts = file.split("-")
-            emotion_code = parts[2]
+def sort_ravdess(raw_folder=RAW_FOLDER, out_folder=OUTPUT_FOLDER, workers=8, mode="auto"):
+    """Incrementally mirror RAVDESS into out_folder/<emotion>/ and keep the manifest up to date.
 
-            if emotion_code not in emotion_map:
-                continue
+    Files whose size and mtime match the manifest (and still exist in
+    out_folder) are skipped without being read; new or changed ones are
+    hashed and linked/copied in a thread pool; outputs whose source is gone
+    are removed. Returns a summary dict.
+    """
+    print("🔍 Looking for RAVDESS at:", raw_folder)
 
-            emotion = emotion_map[emotion_code]
-            dest_dir = os.path.join(OUTPUT_FOLDER, emotion)
+    if not os.path.exists(raw_folder):
+        print("❌ RAVDESS raw folder not found!")
+        return None
 
-            shutil.copy(file_path, dest_dir)
-            print(f"✔ {file} → {emotion}")
+    start = time.perf_counter()
+    os.makedirs(out_folder, exist_ok=True)
 
-    print("\n🎉 Sorting complete!")
-    print("➡ Processed folder:", OUTPUT_FOLDER)
+    # Create emotion dirs
+    for emotion in set(emotion_map.values()):
+        os.makedirs(os.path.join(out_folder, emotion), exist_ok=True)
+
+    old = read_manifest(out_folder)
+    by_source = {entry["source"]: rel for rel, entry in old.items()}
+    entries = {}
+    todo = []
+    claimed = {}     # output rel -> the raw file that maps to it
+    duplicates = []
+
+    for source, label in sorted(scan_raw(raw_folder)):
+        # Same basename under two parents (e.g. the archive extracted twice):
+        # both would land on one output, so only the first is used
+        rel = f"{label}/{os.path.basename(source)}"
+        if rel in claimed:
+            duplicates.append((source, claimed[rel]))
+            continue
+        claimed[rel] = source
+
+        old_rel = by_source.get(source)
+        if old_rel is not None:
+            entry = old[old_rel]
+            st = os.stat(source)
+            if (entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns
+                    and old_rel == rel
+                    and os.path.exists(os.path.join(out_folder, rel))):
+                entries[rel] = entry
+                continue
+        todo.append((source, label))
+
+    summary = {"unchanged": len(entries), "added": 0, "updated": 0, "removed": 0,
+               "failed": 0, "duplicates": len(duplicates), "bytes": 0, "methods": {}}
+    for source, kept in duplicates[:5]:
+        print(f"⚠️ Skipping {source}: same name as {kept}")
+    if len(duplicates) > 5:
+        print(f"⚠️ ... and {len(duplicates) - 5} more files with duplicate names")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [(source, pool.submit(_ingest, source, label, out_folder, mode))
+                   for source, label in todo]
+        for source, future in futures:
+            try:
+                rel, entry = future.result()
+            except OSError as e:
+                summary["failed"] += 1
+                print(f"❌ {source}: {e}")
+                # Keep the previous good output (and its entry) if there was one
+                old_rel = by_source.get(source)
+                if old_rel is not None and os.path.exists(os.path.join(out_folder, old_rel)):
+                    entries[old_rel] = old[old_rel]
+                continue
+            entries[rel] = entry
+            summary["updated" if source in by_source else "added"] += 1
+            summary["bytes"] += entry["size"]
+            summary["methods"][entry["method"]] = summary["methods"].get(entry["method"], 0) + 1
+
+    # Outputs whose source disappeared (or moved to another label)
+    for rel, entry in old.items():
+        if rel not in entries:
+            try:
+                os.remove(os.path.join(out_folder, rel))
+            except OSError:
+                pass
+            summary["removed"] += 1
+
+    write_manifest(entries, out_folder)
+
+    labels = {}
+    for entry in entries.values():
+        labels[entry["label"]] = labels.get(entry["label"], 0) + 1
+    summary["labels"] = labels
+    summary["total"] = len(entries)
+    summary["seconds"] = time.perf_counter() - start
+
+    methods = ", ".join(f"{n} {m}" for m, n in summary["methods"].items()) or "none"
+    print(f"✔ {summary['total']} files ({', '.join(f'{k}: {v}' for k, v in sorted(labels.items()))})")
+    print(f"   {summary['added']} added, {summary['updated']} updated, "
+          f"{summary['unchanged']} unchanged, {summary['removed']} removed, "
+          f"{summary['failed']} failed, {summary['duplicates']} duplicate names — {summary['bytes'] / 1024 ** 2:.1f} MB placed ({methods}) "
+          f"in {summary['seconds']:.1f}s")
+    print("➡ Processed folder:", out_folder)
+    return summary
 
 
 if __name__ == "__main__":
-    sort_ravdess()
+    parser = argparse.ArgumentParser(description="Sort RAVDESS into data/processed/<emotion>/")
+    parser.add_argument("--raw", default=RAW_FOLDER)
+    parser.add_argument("--out", default=OUTPUT_FOLDER)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--mode", default="auto", choices=["auto", "hardlink", "reflink", "copy"])
+    args = parser.parse_args()
+
+    sort_ravdess(args.raw, args.out, args.workers, args.mode)
@@ -0,0 +1,201 @@
+"""
+Disk-backed cache of synthesized replies.
+
+The companion only ever says a small, fixed set of sentences (RESPONSES,
+the fallback line and their name-personalized variants), so each one is
+synthesized once and replayed from disk afterwards. Entries are keyed by
+(text, voice, rate); least-recently-used files are evicted past max_bytes.
+
+Pre-warm every reply (run from src/):
+    python -m utils.tts_cache --prewarm [--names] [--stub]
+"""
+
+import os
+import wave
+import struct
+import math
+import asyncio
+import contextlib
+import hashlib
+import uuid
+import argparse
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "tts_cache")
+DEFAULT_MAX_BYTES = 200 * 1024 ** 2  # 200 MB
+
+VOICE_NAME = "en-US-AriaNeural"
+RATE = "+0%"
+
+
+async def edge_synthesize(text, voice, rate, out_path):
+    import edge_tts
+    communicate = edge_tts.Communicate(text, voice, rate=rate)
+    await communicate.save(out_path)
+
+
+async def edge_stream(text, voice, rate):
+    """Yield encoded MP3 chunks as edge-tts produces them."""
+    import edge_tts
+    communicate = edge_tts.Communicate(text, voice, rate=rate)
+    async for chunk in communicate.stream():
+        if chunk["type"] == "audio":
+            yield chunk["data"]
+
+
+async def tone_synthesize(text, voice, rate, out_path, sample_rate=16000):
+    """Local stand-in for tests/offline use: a short beep whose length follows the text."""
+    seconds = min(0.05 * len(text), 5.0)
+    n = int(sample_rate * seconds)
+    with wave.open(out_path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(b"".join(
+            struct.pack("<h", int(3000 * math.sin(2 * math.pi * 440 * i / sample_rate)))
+            for i in range(n)
+        ))
+
+
+class TTSCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES,
+                 synthesizer=edge_synthesize, ext=".mp3", streamer=edge_stream):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.synthesizer = synthesizer
+        self.streamer = streamer
+        self.ext = ext
+        self._bytes = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path_for(self, text, voice=VOICE_NAME, rate=RATE):
+        key = hashlib.sha1(f"{voice}\0{rate}\0{text}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key + self.ext)
+
+    def lookup(self, text, voice=VOICE_NAME, rate=RATE):
+        """Cached file path for text, or None. A hit counts as a use for LRU."""
+        path = self.path_for(text, voice, rate)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    async def get(self, text, voice=VOICE_NAME, rate=RATE):
+        """Path to the audio for text, synthesizing it on a miss."""
+        path = self.lookup(text, voice, rate)
+        if path:
+            return path
+
+        path = self.path_for(text, voice, rate)
+        tmp_path = self._tmp_path(path)
+        await self.synthesizer(text, voice, rate, tmp_path)
+        self._commit(tmp_path, path)
+        return path
+
+    async def stream(self, text, voice=VOICE_NAME, rate=RATE):
+        """Yield encoded audio chunks for a cache miss while also storing the result.
+
+        Callers should check lookup() first; requires a streamer.
+        """
+        path = self.path_for(text, voice, rate)
+        tmp_path = self._tmp_path(path)
+        try:
+            with open(tmp_path, "wb") as f:
+                async for data in self.streamer(text, voice, rate):
+                    f.write(data)
+                    yield data
+        except BaseException:
+            # Don't leave half-synthesized audio behind
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)
+            raise
+        self._commit(tmp_path, path)
+
+    def _tmp_path(self, path):
+        return f"{path}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp{self.ext}"
+
+    def _commit(self, tmp_path, path):
+        try:
+            replaced = os.path.getsize(path)   # a concurrent miss for the same text
+        except OSError:
+            replaced = 0
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+        self._bytes = self._scan_size() if self._bytes is None else self._bytes - replaced + size
+        if self._bytes > self.max_bytes:
+            self.evict()
+
+    async def prewarm(self, texts, voice=VOICE_NAME, rate=RATE, concurrency=4):
+        """Synthesize every text not cached yet. Returns the number synthesized."""
+        missing = [t for t in dict.fromkeys(texts) if not self.lookup(t, voice, rate)]
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(text):
+            async with sem:
+                await self.get(text, voice, rate)
+
+        await asyncio.gather(*(one(t) for t in missing))
+        return len(missing)
+
+    def _entries(self):
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(self.ext) and ".tmp" not in entry.name:
+                yield entry
+
+    def _scan_size(self):
+        return sum(e.stat().st_size for e in self._entries())
+
+    def evict(self):
+        """Delete least-recently-used entries until the cache is below 90% of max_bytes."""
+        entries = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in self._entries()]
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+        self._bytes = total
+
+
+_default_cache = None
+
+def get_cache():
+    """Process-wide cache; MOOD_TTS_STUB=1 swaps edge-tts for the local tone synthesizer."""
+    global _default_cache
+    if _default_cache is None:
+        if os.environ.get("MOOD_TTS_STUB") == "1":
+            _default_cache = TTSCache(os.path.join(DEFAULT_CACHE_DIR, "stub"),
+                                      synthesizer=tone_synthesize, ext=".wav", streamer=None)
+        else:
+            _default_cache = TTSCache()
+    return _default_cache
+
+
+if __name__ == "__main__":
+    from utils.emotion_responder import all_replies
+    from utils.user_name_memory import all_names
+
+    parser = argparse.ArgumentParser(description="TTS reply cache")
+    parser.add_argument("--prewarm", action="store_true", help="synthesize every reply now")
+    parser.add_argument("--names", action="store_true",
+                        help="also synthesize personalized replies for every stored name")
+    parser.add_argument("--stub", action="store_true", help="use the local tone synthesizer")
+    args = parser.parse_args()
+
+    if args.stub:
+        os.environ["MOOD_TTS_STUB"] = "1"
+    cache = get_cache()
+
+    if args.prewarm:
+        names = all_names() if args.names else []
+        texts = all_replies(names)
+        print(f"🔊 Pre-warming {len(texts)} replies into {cache.cache_dir} ...")
+        done = asyncio.run(cache.prewarm(texts))
+        print(f"✔ Synthesized {done}, {len(texts) - done} already cached")
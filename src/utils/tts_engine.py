@@ -1,35 +1,64 @@
-import edge_tts
 import asyncio
-import os
-from datetime import datetime
-import pygame
+from utils.tts_cache import get_cache, VOICE_NAME, RATE
+from utils.audio_player import get_player
 
-VOICE_NAME = "en-US-AriaNeural"
+async def speak_async(text, interrupt=False, on_done=None):
+    """Start speaking text and return its Utterance without waiting for playback.
 
-async def _speak_async(text):
-    # output path for audio
-    output_file = os.path.join(
-        os.path.dirname(__file__),
-        f"tts_output_{datetime.now().strftime('%H%M%S')}.mp3"
-    )
+    Cached replies play from disk. On a miss the reply is streamed: playback
+    starts from the first audio chunk while the rest is still synthesizing
+    (and being written to the cache). The streaming runs as a task on the
+    current loop, kept on utterance.feeder; the loop must stay alive until it
+    finishes (awaiting the utterance is enough).
+    """
+    cache = get_cache()
+    player = get_player()
+    if interrupt:
+        player.stop()
 
-    communicate = edge_tts.Communicate(text, VOICE_NAME)
-    await communicate.save(output_file)
+    path = cache.lookup(text, VOICE_NAME, RATE)
+    if path or cache.streamer is None:
+        path = path or await cache.get(text, VOICE_NAME, RATE)
+        utterance = player.play(path, on_done)
+        utterance.feeder = None
+        return utterance
 
-    # Play using pygame (stable & smooth on Windows)
-    pygame.mixer.init()
-    pygame.mixer.music.load(output_file)
-    pygame.mixer.music.play()
+    utterance = player.open_stream(on_done)
 
-    # Wait until playback finishes
-    while pygame.mixer.music.get_busy():
-        continue
+    async def feed():
+        try:
+            async for data in cache.stream(text, VOICE_NAME, RATE):
+                utterance.feed(data)
+        finally:
+            utterance.close()
 
-def speak(text):
+    utterance.feeder = asyncio.create_task(feed())
+    return utterance
+
+async def prefetch(texts):
+    """Synthesize texts into the cache ahead of time (e.g. while another reply plays)."""
+    return await get_cache().prewarm(texts)
+
+async def _speak(text, block):
+    utterance = await speak_async(text)
+    if utterance.feeder is not None:
+        await utterance.feeder
+    if block:
+        await utterance
+    return utterance
+
+def speak(text, block=True):
+    """Speak text; with block=True return once playback has finished.
+
+    Called from inside a running event loop (where blocking is impossible)
+    it schedules the speech on that loop and returns the task instead;
+    async code should use speak_async.
+    """
     try:
-        asyncio.run(_speak_async(text))
+        loop = asyncio.get_running_loop()
     except RuntimeError:
-        # Fix for "event loop already running"
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(_speak_async(text))
+        return asyncio.run(_speak(text, block))
+    return loop.create_task(_speak(text, block))
+
+def stop_speaking():
+    get_player().stop()
@@ -1,16 +1,25 @@
-import os
+"""Name memory, kept for existing callers; backed by utils.profile_store.
 
-FILE = os.path.join(os.path.dirname(__file__), "user_name.txt")
+Without a user_id everything reads and writes the shared default user, as
+the old single-file version did. Pass a user_id (e.g. a Streamlit session
+id) to keep names per user.
+"""
 
-def set_name(name: str):
+from utils.profile_store import get_store, DEFAULT_USER, LEGACY_NAME_FILE
+
+FILE = LEGACY_NAME_FILE  # legacy location, imported into the store on first use
+
+def set_name(name: str, user_id=DEFAULT_USER):
     name = name.strip()
     if not name:
         return
-    with open(FILE, "w", encoding="utf-8") as f:
-        f.write(name)
+    get_store().set_name(user_id, name)
+
+def get_name(user_id=DEFAULT_USER):
+    return get_store().get_name(user_id)
+
+def forget_name(user_id=DEFAULT_USER):
+    get_store().forget(user_id)
 
-def get_name():
-    if not os.path.exists(FILE):
-        return None
-    with open(FILE, "r", encoding="utf-8") as f:
-        return f.read().strip()
+def all_names():
+    return get_store().names()
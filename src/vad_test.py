@@ -0,0 +1,33 @@
+import numpy as np
+from features.mfcc_extractor import voice_activity, trim_silence
+
+
+def run_vad_test():
+    """The speech mask must have one entry per frame, even for clips shorter than the hangover."""
+    print("\n🔍 Running VAD TEST...\n")
+
+    sr = 22050
+    rng = np.random.default_rng(0)
+    ok = True
+    for seconds in (0.12, 0.5, 3.0):
+        n = int(sr * seconds)
+        t = np.arange(n) / sr
+        audio = (0.3 * np.sin(2 * np.pi * 180 * t) * (t > seconds / 2)
+                 + 0.001 * rng.standard_normal(n)).astype(np.float32)
+
+        speech, frame, hop = voice_activity(audio, sr)
+        n_frames = 1 + (n - frame) // hop
+        trimmed, stats = trim_silence(audio, sr)
+        passed = len(speech) == n_frames and len(trimmed) == stats.kept_samples <= n
+        ok &= passed
+        print(f"{'✅' if passed else '❌'} {seconds:4.2f}s  mask={len(speech)} frames={n_frames} "
+              f"kept={stats.kept_samples}/{n}")
+
+    print("\n-----------------------------")
+    print("VAD OK" if ok else "VAD FAILED")
+    print("-----------------------------\n")
+    return ok
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_vad_test() else 1)
@@ -7,39 +7,23 @@ Flow:
   4) Generate an emotion-based reply
   5) Personalize reply with name if available
   6) Speak that reply using your TTS engine (edge-tts)
+  7) Repeat for the next turn (one event loop for the whole session)
 """
 
 import os
-from models.predict import predict_emotion
-from utils.emotion_responder import get_response
+import time
+import asyncio
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from features.mfcc_extractor import extract_mfcc
+from models.predict import EMOTIONS
+from inference_client import get_predictor
+from utils.emotion_responder import get_response, personalize_reply, FALLBACK_RESPONSE
 from utils.user_name_memory import set_name, get_name
-from utils.tts_engine import speak   # neural TTS (edge-tts)
+from utils.tts_engine import speak_async, prefetch   # neural TTS (edge-tts)
+from utils import metrics
 import audio_recording as ar
 
-def personalize_reply(reply: str, user_name: str) -> str:
-    """Insert user_name into reply naturally where sensible."""
-    if not user_name:
-        return reply
-
-    # Simple, safe personalization rules
-    # Prefer injecting after common starters
-    starters = [
-        ("I hear", f"I hear you, {user_name}"),
-        ("You sound", f"You sound, {user_name},"),
-        ("I'm here", f"I'm here for you, {user_name}"),
-        ("There", f"{user_name}, there"),
-    ]
-
-    for prefix, replacement in starters:
-        if reply.startswith(prefix):
-            return reply.replace(prefix, replacement, 1)
-
-    # fallback: prepend name politely
-    # keep capitalization sensible
-    if reply and reply[0].isalpha():
-        return f"{user_name}, {reply[0].lower()}{reply[1:]}"
-    return f"{user_name}, {reply}"
-
 def ask_and_save_name_if_missing():
     name = get_name()
     if name:
@@ -54,56 +38,140 @@ def ask_and_save_name_if_missing():
         return typed
     return None
 
-def main():
-    # Ensure working directory is src when running the script
-    cwd = os.getcwd()
-    src_dir = os.path.abspath(os.path.dirname(__file__))
+class TurnPipeline:
+    """Runs conversation turns on one event loop, overlapping the slow stages.
+
+    - blocking work (recording, MFCC, model) runs in a thread executor
+    - TTS starts the moment the emotion is known
+    - the next reply for every emotion is drawn in advance and synthesized
+      into the TTS cache while the current reply plays, so the next turn's
+      reply is usually a cache hit
+    """
+
+    def __init__(self, model_path="models/emotion_model.h5", user_name=None):
+        self.model_path = model_path
+        self.user_name = user_name
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.classifier = get_predictor(model_path)
+        self.next_replies = {}
+        self._prefetch_task = None
+
+    def _draw_reply(self, emotion):
+        return personalize_reply(get_response(emotion), self.user_name)
+
+    def take_reply(self, emotion):
+        reply = self.next_replies.pop(emotion, None) or self._draw_reply(emotion)
+        self.next_replies[emotion] = self._draw_reply(emotion)
+        return reply
 
+    def prefetch_next_replies(self):
+        for emotion in EMOTIONS:
+            self.next_replies.setdefault(emotion, self._draw_reply(emotion))
+        texts = list(self.next_replies.values()) + [FALLBACK_RESPONSE]
+        if self._prefetch_task is None or self._prefetch_task.done():
+            self._prefetch_task = asyncio.create_task(prefetch(texts))
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    async def warm_up(self):
+        try:
+            with metrics.span("model_load", app="cli"):
+                await self._run(self.classifier.load)
+        except Exception as e:
+            # predict() falls back to random output, same as before
+            print("⚠️ Could not load model:", e)
+
+    async def run_turn(self):
+        """One record -> predict -> reply -> speak turn. Returns per-stage timings in ms."""
+        timings = {}
+
+        # 1) RECORD AUDIO (the monitor classifies while you talk)
+        monitor = ar.StreamingEmotionMonitor(model_path=self.model_path)
+        with metrics.span("record", app="cli"):
+            recorded_path = await self._run(ar.record_audio, None, monitor)
+        t_stop = time.perf_counter()
+
+        if not recorded_path or not os.path.exists(recorded_path):
+            print("❌ Recording failed or file not found.")
+            return None
+        print("\n📁 Recorded file:", recorded_path)
+
+        # 2) PREDICT EMOTION (live result, or the full file if streaming produced nothing)
+        emotion, probs = monitor.latest()
+        if emotion is None:
+            print("\n🔍 Predicting emotion...")
+            with metrics.span("extract_mfcc", app="cli"):
+                mfcc = await self._run(partial(extract_mfcc, max_pad_len=None), recorded_path)
+            if mfcc is not None:
+                with metrics.span("predict", app="cli"):
+                    emotion, probs = await self._run(self.classifier.predict, mfcc)
+        t_emotion = time.perf_counter()
+        timings["predict"] = (t_emotion - t_stop) * 1000
+
+        if emotion is None:
+            print("Prediction failed.")
+            return None
+
+        # 3) REPLY + SPEAK: synthesis/playback starts before we print anything
+        with metrics.span("reply", app="cli"):
+            reply = self.take_reply(emotion)
+        with metrics.span("tts_start", app="cli"):
+            utterance = await speak_async(reply)
+        timings["reply"] = (time.perf_counter() - t_emotion) * 1000
+
+        print("\n----------------------------")
+        print("Detected Emotion:", emotion)
+        print("Probabilities:", probs)
+        print("----------------------------")
+        print("\n💬 AI Reply:", reply)
+        print("\n🔊 Speaking reply...\n")
+
+        # 4) While it plays, get the next turn's replies ready
+        self.prefetch_next_replies()
+
+        with metrics.span("tts_first_sound", app="cli"):
+            await self._run(utterance.started.wait)
+        t_sound = time.perf_counter()
+        timings["first_sound"] = (t_sound - t_emotion) * 1000
+        timings["critical_path"] = (t_sound - t_stop) * 1000
+
+        if utterance.feeder is not None:
+            await utterance.feeder
+        await utterance
+        timings["playback"] = (time.perf_counter() - t_sound) * 1000
+
+        metrics.observe("turn_critical_path_seconds", timings["critical_path"] / 1000, app="cli")
+        metrics.inc("turns", app="cli", emotion=emotion)
+        metrics.event("turn", app="cli", emotion=emotion,
+                      **{f"{k}_ms": round(v, 1) for k, v in timings.items()})
+        metrics.export()
+
+        print("⏱ Turn latency: stop→emotion {predict:.0f} ms, emotion→first sound "
+              "{first_sound:.0f} ms, critical path {critical_path:.0f} ms".format(**timings))
+        return timings
+
+    async def run(self):
+        # Load the model while the user gets ready to speak
+        warm = asyncio.create_task(self.warm_up())
+        self.prefetch_next_replies()
+
+        while True:
+            print("\n🎙 Press ENTER to start recording (type q + ENTER to quit)...")
+            if (await self._run(input)).strip().lower() == "q":
+                break
+            await warm
+            print("🎤 Recording... Press ENTER again to stop.\n")
+            await self.run_turn()
+
+        if self._prefetch_task is not None:
+            await self._prefetch_task
+        self.executor.shutdown()
+
+def main():
     # Ask for name if not present
     user_name = ask_and_save_name_if_missing()
-
-    print("\n🎙 Press ENTER to start recording...")
-    input()
-    print("🎤 Recording... Press ENTER again to stop.\n")
-
-    # 1) RECORD AUDIO (your existing recorder handles saving)
-    recorded_path = ar.record_audio()
-
-    if not recorded_path or not os.path.exists(recorded_path):
-        print("❌ Recording failed or file not found.")
-        return
-
-    print("\n📁 Recorded file:", recorded_path)
-
-    # Convert to path relative to src for predict()
-    audio_path_rel = os.path.relpath(recorded_path, start=src_dir)
-
-    # 2) PREDICT EMOTION
-    print("\n🔍 Predicting emotion...")
-    emotion, probs = predict_emotion(audio_path_rel, model_path="models/emotion_model.h5")
-
-    if emotion is None:
-        print("Prediction failed.")
-        return
-
-    print("\n----------------------------")
-    print("Detected Emotion:", emotion)
-    print("Probabilities:", probs)
-    print("----------------------------")
-
-    # 3) GENERATE TEXT REPLY
-    reply = get_response(emotion)
-
-    # 4) PERSONALIZE if name exists
-    if not user_name:
-        user_name = get_name()  # maybe user set it in another run
-    personalized = personalize_reply(reply, user_name)
-
-    print("\n💬 AI Reply:", personalized)
-
-    # 5) SPEAK REPLY (NEURAL VOICE)
-    print("\n🔊 Speaking reply...\n")
-    speak(personalized)
+    asyncio.run(TurnPipeline(user_name=user_name).run())
 
 if __name__ == "__main__":
     main()